@@ -17,7 +17,7 @@ logger = logging.getLogger(__name__)
 # Cancellation registry for streaming conversations
 CANCELLED_THREADS: set[str] = set()
 
-from agents_system_prompts import CODING_AGENT_SYSTEM_PROMPT
+from agents_system_prompts import CODING_AGENT_SYSTEM_PROMPT_TEMPLATE, render_system_prompt
 from agent_coding_tools import (
     file_read_tool,
     create_directory_tool,
@@ -56,7 +56,7 @@ router = APIRouter(prefix="/coding", tags=["coding"])
 
 # Use imported system prompt
 def get_system_prompt():
-    return CODING_AGENT_SYSTEM_PROMPT
+    return render_system_prompt(CODING_AGENT_SYSTEM_PROMPT_TEMPLATE)
 
 # Import dynamic model configuration
 from dynamic_model_config import get_current_gemini_model
@@ -7,7 +7,7 @@ from langgraph.checkpoint.memory import MemorySaver
 import time
 from composio_tools_filtered import filtered_composio_google_search
 
-from agents_system_prompts import CODING_ASK_AGENT_SYSTEM_PROMPT
+from agents_system_prompts import CODING_ASK_AGENT_SYSTEM_PROMPT_TEMPLATE, render_system_prompt
 
 # Import dynamic model configuration
 from dynamic_model_config import get_current_gemini_model
@@ -16,7 +16,7 @@ router = APIRouter(prefix="/coding-ask", tags=["coding-ask"])
 
 # System prompt for the ask-only coding agent
 def get_system_prompt():
-    return CODING_ASK_AGENT_SYSTEM_PROMPT
+    return render_system_prompt(CODING_ASK_AGENT_SYSTEM_PROMPT_TEMPLATE)
 
 # Initialize Gemini LLM with dynamic model selection
 def get_llm():
@@ -11,7 +11,7 @@ import json
 import time
 import asyncio
 import logging
-from agents_system_prompts import FINANCE_AGENT_SYSTEM_PROMPT
+from agents_system_prompts import FINANCE_AGENT_SYSTEM_PROMPT_TEMPLATE, render_system_prompt
 from deep_search_tool import deep_search
 from rate_limiter import rate_limiter
 
@@ -27,7 +27,7 @@ CANCELLED_THREADS: set[str] = set()
 router = APIRouter(prefix="/finance", tags=["finance"])
 
 def get_system_prompt():
-    return FINANCE_AGENT_SYSTEM_PROMPT
+    return render_system_prompt(FINANCE_AGENT_SYSTEM_PROMPT_TEMPLATE)
 
 # Initialize Gemini LLM with dynamic model selection
 def get_llm():
@@ -1,4 +1,5 @@
 import json
+import orjson
 from fastapi import APIRouter, Body
 from langgraph.graph import StateGraph, START, END, MessagesState
 from langgraph.prebuilt import ToolNode, tools_condition
@@ -6,7 +7,7 @@ from langchain_core.runnables import RunnableLambda
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage
 from langgraph.checkpoint.memory import MemorySaver
 import time
-from agents_system_prompts import GAMES_AGENT_SYSTEM_PROMPT
+from agents_system_prompts import GAMES_AGENT_SYSTEM_PROMPT_TEMPLATE, render_system_prompt
 from chess_tool import chess_apply_move, get_legal_moves_for_fen
 from composio_tools_filtered import filtered_composio_google_search
 
@@ -16,7 +17,7 @@ from dynamic_model_config import get_current_gemini_model
 router = APIRouter(prefix="/games", tags=["games"])
 
 def get_system_prompt():
-    return GAMES_AGENT_SYSTEM_PROMPT
+    return render_system_prompt(GAMES_AGENT_SYSTEM_PROMPT_TEMPLATE)
 
 # Initialize Gemini LLM with dynamic model selection
 def get_llm():
@@ -98,8 +99,12 @@ def validate_chess_response(state: MessagesState):
         try:
             # Try to parse tool result as chess tool output
             if isinstance(tool_msg.content, str):
-                import ast
-                tool_result = ast.literal_eval(tool_msg.content)
+                # Tool results are serialized as JSON; older forced results used repr()
+                try:
+                    tool_result = orjson.loads(tool_msg.content)
+                except orjson.JSONDecodeError:
+                    import ast
+                    tool_result = ast.literal_eval(tool_msg.content)
                 if isinstance(tool_result, dict) and "fen" in tool_result:
                     has_real_chess_tool_result = True
                     real_fen = tool_result["fen"]
@@ -173,7 +178,8 @@ def force_chess_tool_execution(state: MessagesState):
     
     # Execute chess tool
     try:
-        tool_result = chess_apply_move(fen=fen, move=selected_move)
+        # Call the underlying function directly; BaseTool.__call__ does not take keyword args
+        tool_result = chess_apply_move.func(fen=fen, move=selected_move)
         tool_call_id = f"forced_{int(time.time())}"
         
         # Create tool call and result
@@ -187,7 +193,7 @@ def force_chess_tool_execution(state: MessagesState):
         )
         
         tool_message = ToolMessage(
-            content=str(tool_result),
+            content=orjson.dumps(tool_result).decode(),
             tool_call_id=tool_call_id
         )
         
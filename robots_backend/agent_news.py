@@ -8,7 +8,7 @@ from langgraph.checkpoint.memory import MemorySaver
 import json
 import asyncio
 import logging
-from agents_system_prompts import NEWS_AGENT_SYSTEM_PROMPT
+from agents_system_prompts import NEWS_AGENT_SYSTEM_PROMPT_TEMPLATE, render_system_prompt
 import time
 from rate_limiter import rate_limiter
 from composio_tools_filtered import filtered_composio_google_search, filtered_composio_news_search
@@ -24,7 +24,7 @@ CANCELLED_THREADS: set[str] = set()
 router = APIRouter(prefix="/news", tags=["news"])
 
 def get_system_prompt():
-    return NEWS_AGENT_SYSTEM_PROMPT
+    return render_system_prompt(NEWS_AGENT_SYSTEM_PROMPT_TEMPLATE)
 
 # Initialize Gemini LLM with dynamic model selection
 def get_llm():
@@ -4,7 +4,7 @@ from langgraph.prebuilt import ToolNode, tools_condition
 from langchain_core.runnables import RunnableLambda
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage
 from langgraph.checkpoint.memory import MemorySaver
-from agents_system_prompts import REALESTATE_AGENT_SYSTEM_PROMPT
+from agents_system_prompts import REALESTATE_AGENT_SYSTEM_PROMPT_TEMPLATE, render_system_prompt
 import time
 from osm_tools import osm_route, osm_poi_search
 from RealtyUS_tools import realty_us_search_buy, realty_us_search_rent
@@ -16,7 +16,7 @@ from dynamic_model_config import get_current_gemini_model
 router = APIRouter(prefix="/realestate", tags=["realestate"])
 
 def get_system_prompt():
-    return REALESTATE_AGENT_SYSTEM_PROMPT
+    return render_system_prompt(REALESTATE_AGENT_SYSTEM_PROMPT_TEMPLATE)
 
 # Initialize Gemini LLM with dynamic model selection
 def get_llm():
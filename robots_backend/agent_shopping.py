@@ -4,7 +4,7 @@ from langgraph.prebuilt import ToolNode, tools_condition
 from langchain_core.runnables import RunnableLambda
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage
 from langgraph.checkpoint.memory import MemorySaver
-from agents_system_prompts import SHOPPING_AGENT_SYSTEM_PROMPT
+from agents_system_prompts import SHOPPING_AGENT_SYSTEM_PROMPT_TEMPLATE, render_system_prompt
 import time
 from composio_tools_filtered import filtered_composio_google_search, filtered_composio_shopping_search
 
@@ -14,7 +14,7 @@ from dynamic_model_config import get_current_gemini_model
 router = APIRouter(prefix="/shopping", tags=["shopping"])
 
 def get_system_prompt():
-    return SHOPPING_AGENT_SYSTEM_PROMPT
+    return render_system_prompt(SHOPPING_AGENT_SYSTEM_PROMPT_TEMPLATE)
 
 # Initialize Gemini LLM with dynamic model selection
 def get_llm():
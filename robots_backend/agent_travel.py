@@ -4,7 +4,7 @@ from langgraph.prebuilt import ToolNode, tools_condition
 from langchain_core.runnables import RunnableLambda
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage
 from langgraph.checkpoint.memory import MemorySaver
-from agents_system_prompts import TRAVEL_AGENT_SYSTEM_PROMPT
+from agents_system_prompts import TRAVEL_AGENT_SYSTEM_PROMPT_TEMPLATE, render_system_prompt
 import time
 from osm_tools import osm_route, osm_poi_search
 from composio_tools_filtered import filtered_composio_image_search, filtered_composio_google_search, filtered_composio_google_maps_search
@@ -16,7 +16,7 @@ from dynamic_model_config import get_current_gemini_model
 router = APIRouter(prefix="/travel", tags=["travel"])
 
 def get_system_prompt():
-    return TRAVEL_AGENT_SYSTEM_PROMPT
+    return render_system_prompt(TRAVEL_AGENT_SYSTEM_PROMPT_TEMPLATE)
 
 # Initialize Gemini LLM with dynamic model selection
 def get_llm():
@@ -1,78 +1,311 @@
 import json
-from typing import Optional
+from typing import NamedTuple, Optional
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
 import uuid
 import chess
 import chess.engine
 import os
+import atexit
+import queue
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+STOCKFISH_PATH = os.getenv('STOCKFISH_PATH', 'stockfish')
+CHESS_DIFFICULTY = os.getenv('CHESS_DIFFICULTY', 'medium')
+# The games agent and frontend only use legal_moves / recommended_move, so the
+# per-move engine analysis is opt-in
+CHESS_INCLUDE_MOVE_ANALYSIS = os.getenv('CHESS_INCLUDE_MOVE_ANALYSIS', 'false').lower() in ('1', 'true', 'yes')
+
+def set_chess_config(stockfish_path: Optional[str] = None, difficulty: Optional[str] = None):
+    """
+    Override the engine path and/or difficulty at runtime.
+    Values are read once from the environment at import; use this to change them afterwards.
+    """
+    global STOCKFISH_PATH, CHESS_DIFFICULTY
+    if stockfish_path is not None:
+        STOCKFISH_PATH = stockfish_path
+        _close_engine_pool()
+    if difficulty is not None:
+        CHESS_DIFFICULTY = difficulty
+
+# Pool of long-lived engines. With move analysis on, root moves are searched in parallel across it;
+# otherwise only evaluate_position uses it, one search at a time, so a single engine is enough
+ENGINE_POOL_SIZE = min(os.cpu_count() or 1, 4) if CHESS_INCLUDE_MOVE_ANALYSIS else 1
+_engine_pool: Optional[queue.Queue] = None
+# Every engine the current pool started, including borrowed ones, so closing can quit them all
+_engine_pool_engines: set = set()
+_engine_pool_lock = threading.Lock()
+# How often a borrower waiting for an engine checks whether its pool was closed meanwhile
+ENGINE_WAIT_POLL_SECONDS = 1.0
+
+def _get_engine_pool() -> queue.Queue:
+    """
+    Return the shared engine pool, starting the engines on first use.
+    """
+    global _engine_pool, _engine_pool_engines
+    with _engine_pool_lock:
+        if _engine_pool is None:
+            engines = []
+            try:
+                for _ in range(ENGINE_POOL_SIZE):
+                    engines.append(chess.engine.SimpleEngine.popen_uci(STOCKFISH_PATH))
+            except Exception:
+                for engine in engines:
+                    engine.quit()
+                raise
+            pool = queue.Queue()
+            for engine in engines:
+                pool.put(engine)
+            _engine_pool = pool
+            _engine_pool_engines = set(engines)
+        return _engine_pool
+
+def _quit_engine(engine):
+    try:
+        engine.quit()
+    except Exception:
+        pass
+
+def _close_engine_pool():
+    """
+    Quit all engines of the pool, including borrowed ones; the pool is rebuilt on next use.
+    Engines borrowed at this point are quit again (no-op) when they are returned.
+    """
+    global _engine_pool, _engine_pool_engines
+    with _engine_pool_lock:
+        _engine_pool = None
+        engines, _engine_pool_engines = _engine_pool_engines, set()
+    for engine in engines:
+        _quit_engine(engine)
+
+def _return_engine(pool: queue.Queue, engine, failed: bool = False):
+    """
+    Give a borrowed engine back to its pool. A failed engine is quit and replaced by a fresh one;
+    an engine whose pool was closed in the meantime is quit instead of being put back.
+    """
+    with _engine_pool_lock:
+        live = pool is _engine_pool
+        if live and not failed:
+            pool.put(engine)
+            return
+        if live:
+            _engine_pool_engines.discard(engine)
+    _quit_engine(engine)
+    if not live:
+        return
+    try:
+        replacement = chess.engine.SimpleEngine.popen_uci(STOCKFISH_PATH)
+    except Exception:
+        # The engine can't be restarted; drop the whole pool rather than leave it short an engine
+        _close_engine_pool()
+        return
+    with _engine_pool_lock:
+        if pool is _engine_pool:
+            _engine_pool_engines.add(replacement)
+            pool.put(replacement)
+            return
+    _quit_engine(replacement)
+
+@contextmanager
+def _borrowed_engine():
+    """
+    Borrow an engine from the shared pool. If it fails with an engine error (including
+    EngineTerminatedError) only that engine is discarded; other errors leave it in the pool.
+    """
+    pool = _get_engine_pool()
+    while True:
+        try:
+            engine = pool.get(timeout=ENGINE_WAIT_POLL_SECONDS)
+        except queue.Empty:
+            engine = None
+        if engine is not None and pool is _engine_pool:
+            break
+        # The pool was closed while we waited: its engines are quit and never come back, so move to the new pool
+        if engine is not None:
+            _quit_engine(engine)
+        if pool is not _engine_pool:
+            pool = _get_engine_pool()
+    failed = False
+    try:
+        yield engine
+    except chess.engine.EngineError:
+        failed = True
+        raise
+    finally:
+        _return_engine(pool, engine, failed)
+
+atexit.register(_close_engine_pool)
+
+class PosEval(NamedTuple):
+    evaluation: int
+    best_move: Optional[str]
+    depth: int
+    engine_available: bool
+    error: Optional[str] = None
+
+class MoveEval(NamedTuple):
+    evaluation: int
+    comment: str
+
+# FEN-keyed cache of position evaluations, filled by evaluate_position and warm_game
+ANALYSIS_CACHE_SIZE = 512
+_cached_analysis: "OrderedDict[str, PosEval]" = OrderedDict()
+_cached_analysis_lock = threading.Lock()
+
+def _get_cached_analysis(fen: str, depth: int) -> Optional[PosEval]:
+    with _cached_analysis_lock:
+        cached = _cached_analysis.get(fen)
+        if cached is None or cached.depth < depth:
+            return None
+        _cached_analysis.move_to_end(fen)
+        return cached
+
+def _store_cached_analysis(fen: str, evaluation: PosEval):
+    with _cached_analysis_lock:
+        existing = _cached_analysis.get(fen)
+        if existing is not None and existing.depth > evaluation.depth:
+            return
+        _cached_analysis[fen] = evaluation
+        _cached_analysis.move_to_end(fen)
+        while len(_cached_analysis) > ANALYSIS_CACHE_SIZE:
+            _cached_analysis.popitem(last=False)
 
 class ChessApplyMoveInput(BaseModel):
     fen: str = Field(..., description="The current chess position in FEN notation (e.g., 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1').")
     move: str = Field(..., description="The chess move to make in UCI format (e.g., 'e2e4', 'g8f6', 'd7d5'). Choose from the available legal moves.")
 
-def evaluate_position(board: chess.Board, depth: int = 10) -> dict:
+def evaluate_position(board: chess.Board, depth: int = 10) -> PosEval:
     """
     Evaluate a chess position using Stockfish engine if available.
     Returns evaluation score and best move analysis.
     """
+    fen = board.fen()
+    cached = _get_cached_analysis(fen, depth)
+    if cached is not None:
+        return cached
     try:
         # Try to use Stockfish engine if available
-        engine_path = os.getenv('STOCKFISH_PATH', 'stockfish')
-        with chess.engine.SimpleEngine.popen_uci(engine_path) as engine:
+        with _borrowed_engine() as engine:
             result = engine.analyse(board, chess.engine.Limit(depth=depth))
             evaluation = result["score"].relative.score(mate_score=10000)
-            best_move = result.get("pv", [])[0] if result.get("pv") else None
+            pv = result.get("pv")
+            best_move = pv[0] if pv else None
             
-            return {
-                "evaluation": evaluation,
-                "best_move": best_move.uci() if best_move else None,
-                "depth": depth,
-                "engine_available": True
-            }
+            position = PosEval(
+                evaluation=evaluation,
+                best_move=best_move.uci() if best_move else None,
+                depth=depth,
+                engine_available=True
+            )
+            _store_cached_analysis(fen, position)
+            return position
     except Exception as e:
         # Fallback to simple evaluation if engine not available
-        return {
-            "evaluation": 0,
-            "best_move": None,
-            "depth": 0,
-            "engine_available": False,
-            "error": str(e)
-        }
+        return PosEval(
+            evaluation=0,
+            best_move=None,
+            depth=0,
+            engine_available=False,
+            error=str(e)
+        )
 
-def analyze_moves(board: chess.Board, legal_moves: list, depth: int = 8) -> dict:
+def warm_game(fen: str, nodes: int = 50000):
+    """
+    Pre-analyze a position and the replies the engine considers most likely.
+    Runs a short multipv search so the first evaluate_position calls for this
+    position and its top continuations are served from the analysis cache.
+    Intended to run in the background (game start, or after each applied move).
+    """
+    try:
+        board = chess.Board(fen)
+        if board.is_game_over():
+            return
+        with _borrowed_engine() as engine:
+            infos = engine.analyse(board, chess.engine.Limit(nodes=nodes), multipv=3)
+    except Exception:
+        # Warming is best effort; the regular evaluation path still works without it
+        return
+    
+    for rank, info in enumerate(infos):
+        pv = info.get("pv")
+        if not pv or "score" not in info:
+            continue
+        evaluation = info["score"].relative.score(mate_score=10000)
+        depth = info.get("depth", 0)
+        if rank == 0:
+            _store_cached_analysis(fen, PosEval(evaluation, pv[0].uci(), depth, True))
+        # The position after this candidate, seen from the opponent's side
+        child = board.copy(stack=False)
+        child.push(pv[0])
+        reply = pv[1].uci() if len(pv) > 1 else None
+        _store_cached_analysis(child.fen(), PosEval(-evaluation, reply, max(depth - 1, 0), True))
+
+# Background warm-up runs on one worker; while a warm-up is queued, newer positions replace it
+# instead of queuing more work, so concurrent games can't pile up threads waiting for engines
+_warm_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chess-warm")
+_warm_next_fen: Optional[str] = None
+_warm_lock = threading.Lock()
+
+def _run_queued_warm():
+    global _warm_next_fen
+    with _warm_lock:
+        fen, _warm_next_fen = _warm_next_fen, None
+    if fen is not None:
+        warm_game(fen)
+
+def schedule_warm_game(fen: str):
+    """
+    Warm `fen` in the background, unless a warm-up is already queued (it then warms `fen` instead).
+    """
+    global _warm_next_fen
+    with _warm_lock:
+        already_queued = _warm_next_fen is not None
+        _warm_next_fen = fen
+    if not already_queued:
+        _warm_executor.submit(_run_queued_warm)
+
+def _analyze_single_move(board: chess.Board, move: chess.Move, move_uci: str, depth: int) -> MoveEval:
+    """
+    Analyze one root move on its own board copy using an engine borrowed from the pool.
+    """
+    board.push(move)
+    with _borrowed_engine() as engine:
+        # Analyze the position after this move
+        result = engine.analyse(board, chess.engine.Limit(depth=depth))
+    evaluation = result["score"].relative.score(mate_score=10000)
+    
+    return MoveEval(evaluation, get_move_comment(board, move_uci, evaluation))
+
+def analyze_moves(board: chess.Board, legal_moves: list, depth: int = 8) -> dict[str, MoveEval]:
     """
     Analyze all legal moves and rank them by strength.
+    Root moves are independent, so they are searched in parallel across the engine pool.
+    `legal_moves` may hold UCI strings or chess.Move objects; results are keyed by UCI.
     """
-    move_analysis = {}
+    move_ucis = [move.uci() if isinstance(move, chess.Move) else move for move in legal_moves]
     
     try:
-        engine_path = os.getenv('STOCKFISH_PATH', 'stockfish')
-        with chess.engine.SimpleEngine.popen_uci(engine_path) as engine:
-            for move_uci in legal_moves:
-                move = chess.Move.from_uci(move_uci)
-                board.push(move)
-                
-                # Analyze the position after this move
-                result = engine.analyse(board, chess.engine.Limit(depth=depth))
-                evaluation = result["score"].relative.score(mate_score=10000)
-                
-                move_analysis[move_uci] = {
-                    "evaluation": evaluation,
-                    "comment": get_move_comment(board, move_uci, evaluation)
-                }
-                
-                board.pop()  # Undo the move
+        # Resolve each move's Move object once, up front
+        moves = [
+            (move_uci, move if isinstance(move, chess.Move) else chess.Move.from_uci(move))
+            for move_uci, move in zip(move_ucis, legal_moves)
+        ]
+        with ThreadPoolExecutor(max_workers=ENGINE_POOL_SIZE) as executor:
+            results = executor.map(
+                lambda item: _analyze_single_move(board.copy(), item[1], item[0], depth),
+                moves
+            )
+            return dict(zip(move_ucis, results))
                 
     except Exception as e:
+        # Engines that failed were already discarded and replaced by _borrowed_engine; the rest
+        # of the pool stays up for concurrent callers
         # Fallback: simple move analysis without engine
-        for move_uci in legal_moves:
-            move_analysis[move_uci] = {
-                "evaluation": 0,
-                "comment": "Engine not available for analysis"
-            }
-    
-    return move_analysis
+        unavailable = MoveEval(0, "Engine not available for analysis")
+        return dict.fromkeys(move_ucis, unavailable)
 
 def get_move_comment(board: chess.Board, move_uci: str, evaluation: int) -> str:
     """
@@ -93,7 +326,7 @@ def get_move_comment(board: chess.Board, move_uci: str, evaluation: int) -> str:
     else:
         return "Bad move - significant disadvantage"
 
-def select_best_move(move_analysis: dict, difficulty: str = "medium") -> str:
+def select_best_move(move_analysis: dict[str, MoveEval], difficulty: str = "medium") -> str:
     """
     Select the best move based on analysis and difficulty level.
     The agent should use this as a suggestion, not blindly follow it.
@@ -102,10 +335,10 @@ def select_best_move(move_analysis: dict, difficulty: str = "medium") -> str:
         return None
     
     # Sort moves by evaluation (best first)
-    sorted_moves = sorted(move_analysis.items(), key=lambda x: x[1]["evaluation"], reverse=True)
+    sorted_moves = sorted(move_analysis.items(), key=lambda x: x[1].evaluation, reverse=True)
     
     # Filter out moves that are clearly bad (very negative evaluation)
-    good_moves = [move for move, analysis in sorted_moves if analysis["evaluation"] > -200]
+    good_moves = [move for move, analysis in sorted_moves if analysis.evaluation > -200]
     
     if not good_moves:
         # If no good moves, return the best available
@@ -130,13 +363,12 @@ def select_best_move(move_analysis: dict, difficulty: str = "medium") -> str:
         import random
         return random.choice(top_moves)
 
-@tool("chess_apply_move", args_schema=ChessApplyMoveInput)
-def chess_apply_move(fen: str, move: str) -> dict:
+def _apply_move_on_board(board: chess.Board, move: str, fen: Optional[str] = None) -> dict:
     """
-    Make a chess move and return the updated game state. Use this tool when you need to make a move in a chess game.
-    The tool will validate the move and return the new position, game status, and a comment about the move.
+    Apply a UCI move to an already parsed board and describe the result.
+    The board is modified in place. Pass the original FEN when it is already
+    known so error results do not have to re-serialize the board.
     """
-    board = chess.Board(fen)
     try:
         chess_move = chess.Move.from_uci(move)
         if chess_move in board.legal_moves:
@@ -149,23 +381,26 @@ def chess_apply_move(fen: str, move: str) -> dict:
             post_evaluation = evaluate_position(board)
             
             status = "active"
-            if board.is_checkmate():
-                status = "checkmate"
-                # Determine who delivered checkmate based on whose turn it is next
-                # If it's white's turn but black just moved, black delivered checkmate
-                # If it's black's turn but white just moved, white delivered checkmate
-                winner = "black" if board.turn else "white"
-                comment = f"Checkmate! {winner.capitalize()} wins."
-            elif board.is_stalemate():
-                status = "stalemate"
-                comment = "Stalemate! Game drawn."
-            elif board.is_insufficient_material():
-                status = "draw"
-                comment = "Draw by insufficient material."
+            # outcome() generates legal moves once for all termination checks
+            outcome = board.outcome(claim_draw=False)
+            if outcome is not None:
+                if outcome.termination == chess.Termination.CHECKMATE:
+                    status = "checkmate"
+                    winner = "white" if outcome.winner == chess.WHITE else "black"
+                    comment = f"Checkmate! {winner.capitalize()} wins."
+                elif outcome.termination == chess.Termination.STALEMATE:
+                    status = "stalemate"
+                    comment = "Stalemate! Game drawn."
+                elif outcome.termination == chess.Termination.INSUFFICIENT_MATERIAL:
+                    status = "draw"
+                    comment = "Draw by insufficient material."
+                else:
+                    status = "draw"
+                    comment = f"Draw by {outcome.termination.name.replace('_', ' ').lower()}."
             elif board.is_check():
-                comment = f"Check! Position evaluation: {post_evaluation['evaluation']}"
+                comment = f"Check! Position evaluation: {post_evaluation.evaluation}"
             else:
-                eval_diff = post_evaluation['evaluation'] - pre_evaluation['evaluation']
+                eval_diff = post_evaluation.evaluation - pre_evaluation.evaluation
                 if eval_diff > 50:
                     comment = f"Strong move! Position improved by {eval_diff} centipawns."
                 elif eval_diff > 0:
@@ -179,44 +414,78 @@ def chess_apply_move(fen: str, move: str) -> dict:
                 "fen": board.fen(),
                 "comment": comment,
                 "status": status,
-                "evaluation": post_evaluation['evaluation'],
-                "pre_evaluation": pre_evaluation['evaluation']
+                "evaluation": post_evaluation.evaluation,
+                "pre_evaluation": pre_evaluation.evaluation
             }
             return result
         else:
             result = {
-                "fen": fen,
+                "fen": fen or board.fen(),
                 "comment": f"Illegal move: {move}",
                 "status": "illegal"
             }
             return result
     except Exception as e:
         result = {
-            "fen": fen,
+            "fen": fen or board.fen(),
             "comment": f"Error: {str(e)}",
             "status": "error"
         }
         return result
 
+@tool("chess_apply_move", args_schema=ChessApplyMoveInput)
+def chess_apply_move(fen: str, move: str) -> dict:
+    """
+    Make a chess move and return the updated game state. Use this tool when you need to make a move in a chess game.
+    The tool will validate the move and return the new position, game status, and a comment about the move.
+    """
+    board = chess.Board(fen)
+    result = _apply_move_on_board(board, move, fen)
+    if result["status"] == "active" and CHESS_INCLUDE_MOVE_ANALYSIS:
+        # Prefetch analysis of likely replies while the LLM writes its response; without move
+        # analysis the single pooled engine is better left free for evaluate_position
+        schedule_warm_game(result["fen"])
+    return result
+
 # Remove the @tool and ChessLegalMovesInput, just define a plain function
 import chess
 
 def get_legal_moves_for_fen(fen: str):
     board = chess.Board(fen)
-    legal_moves = [move.uci() for move in board.legal_moves]
+    moves = list(board.legal_moves)
+    legal_moves = [move.uci() for move in moves]
+    difficulty = CHESS_DIFFICULTY
     
-    # Analyze all legal moves
-    move_analysis = analyze_moves(board, legal_moves)
+    move_analysis = {}
+    best_move = None
+    if difficulty == "hard" or not CHESS_INCLUDE_MOVE_ANALYSIS:
+        # Hard always plays the engine's top choice, and without move analysis only the
+        # recommendation is needed, so a single search of the current position is enough
+        position = evaluate_position(board)
+        best_move = position.best_move
+        if best_move and CHESS_INCLUDE_MOVE_ANALYSIS:
+            move_analysis = {
+                best_move: MoveEval(
+                    position.evaluation,
+                    get_move_comment(board, best_move, position.evaluation)
+                )
+            }
     
-    # Select the best move based on difficulty
-    difficulty = os.getenv('CHESS_DIFFICULTY', 'medium')
-    best_move = select_best_move(move_analysis, difficulty)
+    if not best_move:
+        # Analyze all legal moves; also the fallback when the single search gave no move (e.g. no
+        # engine), since ranking the moves still yields a recommendation
+        all_move_analysis = analyze_moves(board, moves)
+        if CHESS_INCLUDE_MOVE_ANALYSIS:
+            move_analysis = all_move_analysis
+        
+        # Select the best move based on difficulty
+        best_move = select_best_move(all_move_analysis, difficulty)
     
     return {
         "fen": fen,
         "legal_moves": legal_moves,
         "turn": "white" if board.turn else "black",
-        "move_analysis": move_analysis,
+        "move_analysis": {move_uci: analysis._asdict() for move_uci, analysis in move_analysis.items()},
         "recommended_move": best_move,
         "difficulty": difficulty
     } 
\ No newline at end of file
@@ -9,15 +9,42 @@ Analyzers used (runs only what applies to the target file):
 If tools are missing, returns actionable guidance without failing the whole tool.
 """
 
+import io
 import os
+import atexit
 import json
 import re
+import time
+import asyncio
+import codecs
+import hashlib
+import shutil
+import functools
+import operator
 import subprocess
-from typing import List, Dict, Optional, Tuple, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple, Any, Callable, Pattern
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
-import shlex
 import tempfile
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
 
 
 SUPPORTED_LANGS = {
@@ -30,12 +57,89 @@ SUPPORTED_LANGS = {
 }
 
 
+# Compiler diagnostics, matched line-by-line over a whole output buffer (leading/trailing blanks tolerated)
+# tsc: path/to/file.ts(10,5): error TS1234: Message
+_TSC_DIAG_RE = re.compile(
+    r"^[ \t]*(?P<file>.+)\((?P<line>\d+),(?P<col>\d+)\): (?P<level>error|warning) TS(?P<code>\d+): (?P<msg>.+?)[ \t\r]*$",
+    re.MULTILINE,
+)
+# javac: path/File.java:10: error: message, optionally followed by the source line and a "^" caret line
+_JAVAC_DIAG_RE = re.compile(
+    r"^[ \t]*(?P<file>.+):(?P<line>\d+): (?P<level>warning|error): (?P<msg>.+?)[ \t\r]*$"
+    r"(?:(?=\n[^\n]*\n(?P<caret>[^\n^]*)\^))?",
+    re.MULTILINE,
+)
+# mypy plain-text fallback: path:line: col: error: message
+_MYPY_FALLBACK_RE = re.compile(
+    r"^[ \t]*(?P<file>[^:\n]+):(?P<line>\d+):(?:(?P<col>\d+):)? (?P<msg>.+?)[ \t\r]*$",
+    re.MULTILINE,
+)
+
+
+_SEVERITY_RANK = {"error": 0, "failure": 0, "warning": 1, "info": 2}
+
+
+@dataclass(slots=True, frozen=True)
+class Issue:
+    """One analyzer finding. Parsers build these; results are converted to dicts only at the tool boundary."""
+    tool: str
+    severity: str
+    message: Optional[str]
+    file: Optional[str] = None
+    line: Optional[int] = None
+    column: Optional[int] = None
+    end_line: Optional[int] = None
+    end_column: Optional[int] = None
+    code: Optional[str] = None
+    raw: Optional[str] = None
+    # (severity rank, file, line, column), computed once so result sorting needs no Python comparator
+    sort_key: Tuple[int, str, int, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        rank = _SEVERITY_RANK.get(str(self.severity).lower(), 3)
+        object.__setattr__(self, "sort_key", (rank, self.file or "", self.line or 0, self.column or 0))
+
+    def to_dict(self) -> Dict[str, Any]:
+        # Same keys as the tool's JSON contract; unset optional fields are omitted
+        d: Dict[str, Any] = {"tool": self.tool, "severity": self.severity, "message": self.message}
+        for key, value in (
+            ("file", self.file),
+            ("line", self.line),
+            ("column", self.column),
+            ("endLine", self.end_line),
+            ("endColumn", self.end_column),
+            ("code", self.code),
+            ("raw", self.raw),
+        ):
+            if value is not None:
+                d[key] = value
+        return d
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "Issue":
+        return cls(
+            tool=d["tool"],
+            severity=d["severity"],
+            message=d.get("message"),
+            file=d.get("file"),
+            line=d.get("line"),
+            column=d.get("column"),
+            end_line=d.get("endLine"),
+            end_column=d.get("endColumn"),
+            code=d.get("code"),
+            raw=d.get("raw"),
+        )
+
+
 class AnalyzeInput(BaseModel):
     file_path: str = Field(..., description="Absolute or project-relative path to the file to analyze")
     # Optional working directory hint (useful for monorepos)
     cwd: Optional[str] = Field(None, description="Working directory for running analyzers")
     # Optional language override if the extension is non-standard
     language: Optional[str] = Field(None, description="Override language detection: python|typescript|javascript|java")
+    # Duplicate detection (pylint R0801, jscpd) is skipped for files below either threshold; 0 disables a threshold
+    dup_min_bytes: int = Field(2048, description="Minimum file size in bytes for duplicate-code detection")
+    dup_min_lines: int = Field(50, description="Minimum line count for duplicate-code detection")
 
 
 def _detect_language(path: str, override: Optional[str]) -> Optional[str]:
@@ -51,6 +155,11 @@ def _workspace_root() -> str:
     # Always use uploaded workspace as project root (see project_index.PROJECT_ROOT)
     return os.path.abspath(os.path.join(os.path.dirname(os.path.dirname(__file__)), "uploaded_files", "workspace"))
 
+
+# [robots_backend/]uploaded_files/workspace or /uploaded_files/workspace, plus any separators after it
+_WORKSPACE_PREFIX_RE = re.compile(r"(?:robots_backend/|/)?uploaded_files/workspace[\\/]*", re.IGNORECASE)
+
+
 def _norm_path(path: str, cwd: Optional[str]) -> str:
     # Resolve to workspace root by default, honoring provided cwd when given.
     p = os.path.normpath(os.path.expanduser(str(path).strip()))
@@ -59,212 +168,537 @@ def _norm_path(path: str, cwd: Optional[str]) -> str:
 
     # Support inputs prefixed with '/uploaded_files/workspace'
     normalized = p.replace("\\", "/")
-    prefixes = [
-        "uploaded_files/workspace",
-        "robots_backend/uploaded_files/workspace",
-        "/uploaded_files/workspace",
-        "\\uploaded_files\\workspace",
-    ]
-    for pref in prefixes:
-        if normalized.lower().startswith(pref.replace("\\", "/").lower()):
-            p = normalized[len(pref):].lstrip("\\/") if len(normalized) >= len(pref) else ""
-            break
+    m = _WORKSPACE_PREFIX_RE.match(normalized)
+    if m:
+        p = normalized[m.end():]
 
     base = os.path.abspath(cwd) if cwd else _workspace_root()
     return os.path.abspath(os.path.join(base, p))
 
 
-def _run(cmd: List[str] | str, cwd: Optional[str] = None, timeout: int = 90) -> Tuple[int, str, str]:
-    # Use shell=True for Windows to resolve "npx" etc., but prefer list when possible
-    use_shell = isinstance(cmd, str)
+_EXE_CACHE: Dict[str, str] = {}
+
+
+def _which(name: str) -> str:
+    # Resolve an executable once per process (npx -> npx.cmd on Windows); fall back to the bare name
+    if name not in _EXE_CACHE:
+        _EXE_CACHE[name] = shutil.which(name) or shutil.which(name + ".cmd") or name
+    return _EXE_CACHE[name]
+
+
+# Cap on concurrently running analyzer processes. Semaphores are per event loop because
+# analyze_code_quality may run each call under its own asyncio.run.
+_MAX_PROCS = os.cpu_count() or 4
+_proc_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def configure_parallelism(n: int) -> None:
+    """Set the maximum number of analyzer subprocesses that may run at once (per event loop)."""
+    global _MAX_PROCS
+    _MAX_PROCS = max(1, int(n))
+    _proc_semaphores.clear()
+
+
+def _proc_semaphore() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    sem = _proc_semaphores.get(loop)
+    if sem is None:
+        sem = _proc_semaphores[loop] = asyncio.Semaphore(_MAX_PROCS)
+    return sem
+
+
+def _bounded(fn):
+    # Hold a process slot for the whole lifetime of the subprocess, not just its spawn
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        async with _proc_semaphore():
+            return await fn(*args, **kwargs)
+    return wrapper
+
+
+@_bounded
+async def _run_async(cmd: List[str], cwd: Optional[str] = None, timeout: int = 90, text: bool = True) -> Tuple[int, Any, Any]:
+    # text=False returns raw bytes, which the JSON parsers consume without a decode step
     try:
-        proc = subprocess.run(
-            cmd,
-            cwd=cwd,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            timeout=timeout,
-            shell=use_shell,
+        proc = await asyncio.create_subprocess_exec(
+            _which(cmd[0]), *cmd[1:], cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.PIPE
         )
-        return proc.returncode, proc.stdout, proc.stderr
     except FileNotFoundError as e:
         return 127, "", str(e)
-    except subprocess.TimeoutExpired as e:
-        return 124, e.stdout or "", e.stderr or f"Command timed out after {timeout}s"
+    try:
+        out, err = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return 124, "", f"Command timed out after {timeout}s"
+    if not text:
+        return proc.returncode, out, err
+    return proc.returncode, out.decode("utf-8", errors="replace"), err.decode("utf-8", errors="replace")
+
+
+class _StreamScanner:
+    """
+    Incremental finditer over chunked tool output. Matches are emitted once their line
+    (plus `holdback_lines` lookahead lines) is complete; only the unmatched tail is kept.
+    """
+
+    def __init__(self, regex: Pattern[str], to_issue: Callable[[Any], Issue], holdback_lines: int = 0):
+        self._regex = regex
+        self._to_issue = to_issue
+        self._holdback_lines = holdback_lines
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._buf = ""
+        self.issues: List[Issue] = []
+
+    def feed(self, chunk: bytes, final: bool = False) -> None:
+        buf = self._buf + self._decoder.decode(chunk, final)
+        if final:
+            safe = len(buf)
+        else:
+            # Start of the first line that is either partial or still needed as lookahead
+            safe = buf.rfind("\n") + 1
+            for _ in range(self._holdback_lines):
+                if safe == 0:
+                    break
+                safe = buf.rfind("\n", 0, safe - 1) + 1
+        for m in self._regex.finditer(buf):
+            if m.start() >= safe:
+                break
+            self.issues.append(self._to_issue(m))
+        self._buf = buf[safe:]
+
+
+@_bounded
+async def _run_streaming(cmd: List[str], sink: _StreamScanner, cwd: Optional[str] = None, timeout: int = 90) -> int:
+    # Like _run_async, but output is fed to the scanner chunk by chunk instead of being buffered whole.
+    # stderr is merged into stdout so diagnostics from either stream go through a single scan.
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            _which(cmd[0]), *cmd[1:], cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT
+        )
+    except FileNotFoundError:
+        return 127
+
+    async def pump() -> None:
+        while chunk := await proc.stdout.read(io.DEFAULT_BUFFER_SIZE):
+            sink.feed(chunk)
+        sink.feed(b"", final=True)
+
+    try:
+        await asyncio.wait_for(asyncio.gather(pump(), proc.wait()), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        return 124
+    return proc.returncode
+
+
+def _text(data: Any) -> str:
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data).decode("utf-8", errors="replace")
+    return data or ""
+
+
+def _run_coroutine(coro):
+    """Run a coroutine to completion from sync code, even if this thread already has a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+# Only hits are cached, and each hit is re-checked: configs and node_modules can appear or
+# disappear at any time (npm install, file tools, shell commands)
+_FIND_UPWARDS_CACHE: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_FIND_UPWARDS_CACHE_MAX_ENTRIES = 4096
 
 
 def _find_upwards(start_dir: str, target_name: str) -> Optional[str]:
+    key = (start_dir, target_name)
+    found = _FIND_UPWARDS_CACHE.get(key)
+    if found is not None and os.path.exists(os.path.join(found, target_name)):
+        _FIND_UPWARDS_CACHE.move_to_end(key)
+        return found
+
     cur = os.path.abspath(start_dir)
     while True:
         candidate = os.path.join(cur, target_name)
         if os.path.exists(candidate):
+            _FIND_UPWARDS_CACHE[key] = cur
+            if len(_FIND_UPWARDS_CACHE) > _FIND_UPWARDS_CACHE_MAX_ENTRIES:
+                _FIND_UPWARDS_CACHE.popitem(last=False)
             return cur
         parent = os.path.dirname(cur)
         if parent == cur:
+            _FIND_UPWARDS_CACHE.pop(key, None)
             return None
         cur = parent
 
 
-def _parse_eslint_json(out: str) -> List[Dict[str, Any]]:
+# --------- Persistent analyzer result cache ---------
+#
+# Results are stored per (analyzer, file, cwd) under ~/.cache/robots_ai/lint.
+# Fast path: the file's and config files' (mtime_ns, size) match the stored entry.
+# Slow path: the content hash (file bytes + tool versions + config bytes) matches,
+# e.g. after a touch or checkout that did not change anything.
+
+_LINT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "robots_ai", "lint")
+_LINT_CACHE_TTL = 24 * 60 * 60
+_LINT_CACHE_MAX_ENTRIES = 2000
+_LINT_CACHE_EVICT_EVERY = 50
+
+_tool_versions: Dict[str, str] = {}
+_lint_cache_writes = 0
+
+# In-process tier in front of the disk cache: records of recently seen entries, keyed by entry path,
+# so re-checking an unchanged file skips reading and unpacking its entry
+_MEM_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_MEM_CACHE_MAX_ENTRIES = 2000
+
+
+def _hash_bytes(*chunks: bytes) -> bytes:
+    h = _blake3() if _blake3 else hashlib.blake2b(digest_size=32)
+    for chunk in chunks:
+        h.update(chunk)
+    return h.digest()
+
+
+def _pack(obj: Any) -> bytes:
+    if msgpack:
+        return msgpack.packb(obj, use_bin_type=True)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _unpack(data: bytes) -> Any:
+    if msgpack:
+        return msgpack.unpackb(data, raw=False)
+    return json.loads(data)
+
+
+async def _tool_version(name: str) -> str:
+    # Probed once per process; "" when the tool is not on PATH
+    if name not in _tool_versions:
+        cmd = [name, "-version"] if name == "javac" else [name, "--version"]
+        rc, out, err = await _run_async(cmd, timeout=30)
+        _tool_versions[name] = "" if rc == 127 else (out or err).strip()
+    return _tool_versions[name]
+
+
+def _config_paths(path: str, cfg_files: Tuple[str, ...]) -> List[str]:
+    start_dir = os.path.dirname(path)
+    paths = []
+    for name in cfg_files:
+        found = _find_upwards(start_dir, name)
+        if found:
+            paths.append(os.path.join(found, name))
+    return paths
+
+
+def _stat_signature(paths: List[str]) -> List[List[Any]]:
+    sig = []
+    for p in paths:
+        st = os.stat(p)
+        sig.append([p, st.st_mtime_ns, st.st_size])
+    return sig
+
+
+def _cache_key(abs_path: str, versions: List[str], cfg_paths: List[str]) -> str:
+    chunks = [b"\0".join(v.encode("utf-8") for v in versions)]
+    for p in [abs_path] + cfg_paths:
+        with open(p, "rb") as f:
+            chunks.append(p.encode("utf-8"))
+            chunks.append(f.read())
+    return _hash_bytes(*chunks).hex()
+
+
+def _lint_cache_entry_path(analyzer: str, abs_path: str, cwd: Optional[str]) -> str:
+    name = _hash_bytes(analyzer.encode("utf-8"), b"\0", abs_path.encode("utf-8"), b"\0", (cwd or "").encode("utf-8")).hex()
+    return os.path.join(_LINT_CACHE_DIR, name)
+
+
+def _lint_cache_load(entry_path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(entry_path, "rb") as f:
+            record = _unpack(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(record, dict) or time.time() - record.get("created", 0) > _LINT_CACHE_TTL:
+        return None
+    return record
+
+
+def _lint_cache_store(entry_path: str, record: Dict[str, Any]) -> None:
+    global _lint_cache_writes
+    tmp_path = f"{entry_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(_LINT_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(_pack(record))
+        os.replace(tmp_path, entry_path)
+    except (OSError, TypeError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+    _lint_cache_writes += 1
+    if _lint_cache_writes % _LINT_CACHE_EVICT_EVERY == 0:
+        _lint_cache_evict()
+
+
+def _lint_cache_evict() -> None:
+    # LRU by file mtime (hits touch their entry)
+    try:
+        entries = [(e.stat().st_mtime, e.path) for e in os.scandir(_LINT_CACHE_DIR) if e.is_file()]
+    except OSError:
+        return
+    if len(entries) <= _LINT_CACHE_MAX_ENTRIES:
+        return
+    entries.sort()
+    for _, p in entries[:len(entries) - _LINT_CACHE_MAX_ENTRIES]:
+        try:
+            os.remove(p)
+        except OSError:
+            pass
+
+
+def _mem_cache_put(entry_path: str, record: Dict[str, Any]) -> None:
+    _MEM_CACHE[entry_path] = record
+    _MEM_CACHE.move_to_end(entry_path)
+    if len(_MEM_CACHE) > _MEM_CACHE_MAX_ENTRIES:
+        _MEM_CACHE.popitem(last=False)
+
+
+def cached_tool_result(analyzer: str, tools: Tuple[str, ...], cfg_files: Tuple[str, ...] = ()):
+    """
+    Cache an async `(path, cwd) -> (issues, suggestions)` analyzer on disk.
+    `tools` are the executables whose versions invalidate the cache; `cfg_files` are
+    config file names looked up from the target file's directory upwards.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(path: str, cwd: Optional[str]):
+            abs_path = os.path.abspath(path)
+            try:
+                versions = list(await asyncio.gather(*(_tool_version(t) for t in tools)))
+                cfg_paths = _config_paths(abs_path, cfg_files)
+                stat_sig = _stat_signature([abs_path] + cfg_paths) + [versions]
+            except OSError:
+                return await fn(path, cwd)
+
+            entry_path = _lint_cache_entry_path(analyzer, abs_path, cwd)
+            record = _MEM_CACHE.get(entry_path)
+            if record is not None and record["stat"] == stat_sig and time.time() - record["created"] <= _LINT_CACHE_TTL:
+                _MEM_CACHE.move_to_end(entry_path)
+                return [Issue.from_dict(d) for d in record["issues"]], list(record["suggestions"])
+
+            record = _lint_cache_load(entry_path)
+            if record is not None and record.get("stat") == stat_sig:
+                _mem_cache_put(entry_path, record)
+                try:
+                    os.utime(entry_path)
+                except OSError:
+                    # Evicted by a concurrent run; the record we already loaded is still valid
+                    pass
+                return [Issue.from_dict(d) for d in record["issues"]], record["suggestions"]
+
+            try:
+                key = _cache_key(abs_path, versions, cfg_paths)
+            except OSError:
+                return await fn(path, cwd)
+            if record is not None and record.get("key") == key:
+                record["stat"] = stat_sig
+                _lint_cache_store(entry_path, record)
+                _mem_cache_put(entry_path, record)
+                return [Issue.from_dict(d) for d in record["issues"]], record["suggestions"]
+
+            issues, suggestions = await fn(path, cwd)
+            record = {
+                "stat": stat_sig,
+                "key": key,
+                "created": time.time(),
+                "issues": [i.to_dict() for i in issues],
+                "suggestions": list(suggestions),
+            }
+            _lint_cache_store(entry_path, record)
+            _mem_cache_put(entry_path, record)
+            return issues, suggestions
+        return wrapper
+    return decorator
+
+
+@functools.lru_cache(maxsize=256)
+def _scan_bin_dir(path: str, mtime_ns: int) -> frozenset:
+    # One directory listing instead of an exists() probe per candidate name; mtime_ns in the key drops stale listings
+    try:
+        with os.scandir(path) as it:
+            return frozenset(entry.name for entry in it)
+    except OSError:
+        return frozenset()
+
+
+def _find_node_bin(start_dir: str, bin_name: str) -> Optional[str]:
+    # _find_upwards returns the directory that contains node_modules
+    project_dir = _find_upwards(start_dir, "node_modules")
+    if not project_dir:
+        return None
+    bin_dir = os.path.join(project_dir, "node_modules", ".bin")
+    try:
+        names = _scan_bin_dir(bin_dir, os.stat(bin_dir).st_mtime_ns)
+    except OSError:
+        return None
+    if os.name == "nt" and bin_name + ".cmd" in names:
+        return os.path.join(bin_dir, bin_name + ".cmd")
+    return os.path.join(bin_dir, bin_name) if bin_name in names else None
+
+
+def _parse_eslint_json(out: bytes | str) -> List[Issue]:
     try:
-        data = json.loads(out or "[]")
-        issues: List[Dict[str, Any]] = []
+        data = orjson.loads(out or b"[]")
+        issues: List[Issue] = []
         for file_report in data:
             file_path = file_report.get("filePath")
             for m in file_report.get("messages", []):
-                issues.append({
-                    "tool": "eslint",
-                    "severity": "error" if m.get("severity") == 2 else "warning",
-                    "message": m.get("message"),
-                    "file": file_path,
-                    "line": m.get("line"),
-                    "column": m.get("column"),
-                    "endLine": m.get("endLine"),
-                    "endColumn": m.get("endColumn"),
-                    "code": m.get("ruleId"),
-                })
+                issues.append(Issue(
+                    tool="eslint",
+                    severity="error" if m.get("severity") == 2 else "warning",
+                    message=m.get("message"),
+                    file=file_path,
+                    line=m.get("line"),
+                    column=m.get("column"),
+                    end_line=m.get("endLine"),
+                    end_column=m.get("endColumn"),
+                    code=m.get("ruleId"),
+                ))
         return issues
     except Exception:
-        return [{
-            "tool": "eslint",
-            "severity": "info",
-            "message": "Failed to parse ESLint JSON output.",
-            "raw": out,
-        }]
-
-
-def _parse_tsc_output(out: str, err: str) -> List[Dict[str, Any]]:
-    # Typical line: path/to/file.ts(10,5): error TS1234: Message
-    pattern = re.compile(r"^(?P<file>.+)\((?P<line>\d+),(?P<col>\d+)\): (?P<level>error|warning) TS(?P<code>\d+): (?P<msg>.+)$")
-    issues: List[Dict[str, Any]] = []
-    for stream in [out, err]:
-        for line in (stream or "").splitlines():
-            m = pattern.match(line.strip())
-            if m:
-                issues.append({
-                    "tool": "tsc",
-                    "severity": m.group("level"),
-                    "message": m.group("msg"),
-                    "file": m.group("file"),
-                    "line": int(m.group("line")),
-                    "column": int(m.group("col")),
-                    "code": f"TS{m.group('code')}",
-                })
-    return issues
-
-
-def _parse_mypy_json(out: str) -> List[Dict[str, Any]]:
-    issues: List[Dict[str, Any]] = []
+        return [Issue(
+            tool="eslint",
+            severity="info",
+            message="Failed to parse ESLint JSON output.",
+            raw=_text(out),
+        )]
+
+
+def _tsc_issue(m: Any) -> Issue:
+    return Issue(
+        tool="tsc",
+        severity=m.group("level"),
+        message=m.group("msg"),
+        file=m.group("file"),
+        line=int(m.group("line")),
+        column=int(m.group("col")),
+        code=f"TS{m.group('code')}",
+    )
+
+
+def _parse_mypy_json(out: bytes | str) -> List[Issue]:
+    issues: List[Issue] = []
+    text = _text(out).strip()
+    if not text:
+        return issues
     try:
-        data = json.loads(out or "[]")
+        # mypy --output json prints one object per line; accept a single array as well
+        if text.startswith("["):
+            data = orjson.loads(text)
+        else:
+            data = [orjson.loads(line) for line in text.splitlines() if line.startswith("{")]
+            if not data:
+                raise ValueError("no JSON diagnostics in mypy output")
         for entry in data:
             if not isinstance(entry, dict):
                 continue
-            issues.append({
-                "tool": "mypy",
-                "severity": "error" if entry.get("severity") in ("error", "failure") else (entry.get("severity") or "warning"),
-                "message": entry.get("message"),
-                "file": entry.get("path"),
-                "line": entry.get("line"),
-                "column": entry.get("column"),
-                "code": entry.get("code"),
-            })
+            column = entry.get("column")
+            end_column = entry.get("end_column")
+            issues.append(Issue(
+                tool="mypy",
+                severity="error" if entry.get("severity") in ("error", "failure") else (entry.get("severity") or "warning"),
+                message=entry.get("message"),
+                file=entry.get("file") or entry.get("path"),
+                line=entry.get("line"),
+                # JSON columns are 0-based; report 1-based like the text output and the other tools
+                column=column + 1 if isinstance(column, int) and column >= 0 else None,
+                end_line=entry.get("end_line"),
+                end_column=end_column + 1 if isinstance(end_column, int) and end_column >= 0 else None,
+                code=entry.get("code"),
+            ))
         return issues
     except Exception:
         # fallback: parse simple "path:line: col: error: message"
-        fallback: List[Dict[str, Any]] = []
-        for line in (out or "").splitlines():
-            # Rough fallback parse
-            m = re.match(r"^(?P<file>[^:]+):(?P<line>\d+):(?:(?P<col>\d+):)? (?P<msg>.+)$", line.strip())
-            if m:
-                fallback.append({
-                    "tool": "mypy",
-                    "severity": "error",
-                    "message": m.group("msg"),
-                    "file": m.group("file"),
-                    "line": int(m.group("line")),
-                    "column": int(m.group("col") or 1),
-                })
+        fallback: List[Issue] = []
+        for m in _MYPY_FALLBACK_RE.finditer(text):
+            fallback.append(Issue(
+                tool="mypy",
+                severity="error",
+                message=m.group("msg"),
+                file=m.group("file"),
+                line=int(m.group("line")),
+                column=int(m.group("col") or 1),
+            ))
         if fallback:
             return fallback
-        return [{
-            "tool": "mypy",
-            "severity": "info",
-            "message": "Failed to parse mypy output.",
-            "raw": out,
-        }]
+        return [Issue(
+            tool="mypy",
+            severity="info",
+            message="Failed to parse mypy output.",
+            raw=text,
+        )]
 
 
-def _parse_ruff_json(out: str) -> List[Dict[str, Any]]:
-    issues: List[Dict[str, Any]] = []
+def _parse_ruff_json(out: bytes | str) -> List[Issue]:
+    issues: List[Issue] = []
     try:
-        data = json.loads(out or "[]")
+        data = orjson.loads(out or b"[]")
         for e in data:
             # Ruff JSON format has keys: filename, code, message, location: {row, column}, end: {row, column}, etc.
-            issues.append({
-                "tool": "ruff",
-                "severity": "warning",
-                "message": e.get("message"),
-                "file": e.get("filename"),
-                "line": (e.get("location") or {}).get("row"),
-                "column": (e.get("location") or {}).get("column"),
-                "endLine": (e.get("end") or {}).get("row"),
-                "endColumn": (e.get("end") or {}).get("column"),
-                "code": e.get("code"),
-            })
+            issues.append(Issue(
+                tool="ruff",
+                severity="warning",
+                message=e.get("message"),
+                file=e.get("filename"),
+                line=(e.get("location") or {}).get("row"),
+                column=(e.get("location") or {}).get("column"),
+                end_line=(e.get("end_location") or e.get("end") or {}).get("row"),
+                end_column=(e.get("end_location") or e.get("end") or {}).get("column"),
+                code=e.get("code"),
+            ))
         return issues
     except Exception:
-        return [{
-            "tool": "ruff",
-            "severity": "info",
-            "message": "Failed to parse Ruff JSON output.",
-            "raw": out,
-        }]
+        return [Issue(
+            tool="ruff",
+            severity="info",
+            message="Failed to parse Ruff JSON output.",
+            raw=_text(out),
+        )]
 
 
-def _parse_javac_output(out: str, err: str) -> List[Dict[str, Any]]:
+def _javac_issue(m: Any) -> Issue:
     # Typical: path\File.java:10: error: message
     #          <code line>
     #                        ^
-    pattern = re.compile(r"^(?P<file>.+):(?P<line>\d+): (?P<level>warning|error): (?P<msg>.+)$")
-    issues: List[Dict[str, Any]] = []
-    for stream in [out, err]:
-        lines = (stream or "").splitlines()
-        for i, line in enumerate(lines):
-            m = pattern.match(line.strip())
-            if m:
-                level = m.group("level")
-                msg = m.group("msg")
-                file_path = m.group("file")
-                line_no = int(m.group("line"))
-                col = None
-                # Heuristic: next lines may contain caret "^" positioning
-                if i + 2 < len(lines) and "^" in lines[i + 2]:
-                    col = lines[i + 2].find("^") + 1
-                    if col == 0:
-                        col = None
-                issues.append({
-                    "tool": "javac",
-                    "severity": level,
-                    "message": msg,
-                    "file": file_path,
-                    "line": line_no,
-                    "column": col,
-                })
-    return issues
-
-
-def _analyze_python(path: str, cwd: Optional[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+    # Heuristic: the caret two lines below marks the column
+    caret = m.group("caret")
+    return Issue(
+        tool="javac",
+        severity=m.group("level"),
+        message=m.group("msg"),
+        file=m.group("file"),
+        line=int(m.group("line")),
+        column=len(caret) + 1 if caret is not None else None,
+    )
+
+
+async def _python_ruff(paths: List[str], cwd: Optional[str]) -> Tuple[List[Issue], List[str]]:
     suggestions: List[str] = []
-    issues: List[Dict[str, Any]] = []
+    issues: List[Issue] = []
 
-    # Ruff
-    # Prefer "ruff check --format json"; fallback to "ruff --format json"
-    rc, out, err = _run(["ruff", "check", "--format", "json", path], cwd=cwd)
+    # Prefer "ruff check --output-format json"; fallback to "ruff --format json"
+    rc, out, err = await _run_async(["ruff", "check", "--output-format", "json", *paths], cwd=cwd, text=False)
     if rc == 127:
         # Command not found; try plain 'ruff --format json'
-        rc2, out2, err2 = _run(["ruff", "--format", "json", path], cwd=cwd)
+        rc2, out2, err2 = await _run_async(["ruff", "--format", "json", *paths], cwd=cwd, text=False)
         if rc2 == 127:
             suggestions.append("Install ruff (added to requirements.txt): pip install ruff")
         else:
@@ -272,8 +706,56 @@ def _analyze_python(path: str, cwd: Optional[str]) -> Tuple[List[Dict[str, Any]]
     else:
         issues.extend(_parse_ruff_json(out))
 
-    # mypy
-    rc, out, err = _run(["mypy", "--hide-error-codes", "--no-error-summary", "--show-column-numbers", "--no-color-output", "--error-format=json", path], cwd=cwd)
+    return issues, suggestions
+
+
+_MYPY_FLAGS = ["--hide-error-codes", "--no-error-summary", "--show-column-numbers", "--no-color-output", "--output", "json"]
+
+# Working directories with a dmypy daemon we started (its status file lives in the cwd); only these are stopped at exit
+_dmypy_cwds: set = set()
+# Working directories known to have a running daemon, including ones started by someone else
+_dmypy_running_cwds: set = set()
+
+
+def _stop_dmypy_daemons() -> None:
+    for daemon_cwd in list(_dmypy_cwds):
+        try:
+            subprocess.run([_which("dmypy"), "stop"], cwd=daemon_cwd, capture_output=True, timeout=10)
+        except (OSError, subprocess.SubprocessError):
+            pass
+    _dmypy_cwds.clear()
+    _dmypy_running_cwds.clear()
+
+
+atexit.register(_stop_dmypy_daemons)
+
+
+async def _ensure_dmypy_started(cwd: Optional[str]) -> bool:
+    # False when dmypy is unavailable or the daemon would not start; callers fall back to plain mypy
+    daemon_cwd = os.path.abspath(cwd or os.getcwd())
+    if daemon_cwd in _dmypy_running_cwds:
+        return True
+    rc, _, _ = await _run_async(["dmypy", "status"], cwd=daemon_cwd, timeout=30)
+    if rc == 127:
+        return False
+    if rc != 0:
+        rc, _, _ = await _run_async(["dmypy", "start", "--", *_MYPY_FLAGS], cwd=daemon_cwd, timeout=60)
+        if rc != 0:
+            return False
+        _dmypy_cwds.add(daemon_cwd)
+    _dmypy_running_cwds.add(daemon_cwd)
+    return True
+
+
+async def _python_mypy(paths: List[str], cwd: Optional[str]) -> Tuple[List[Issue], List[str]]:
+    suggestions: List[str] = []
+    issues: List[Issue] = []
+
+    # A warm dmypy daemon skips interpreter startup and re-analysis of unchanged imports
+    if await _ensure_dmypy_started(cwd):
+        rc, out, err = await _run_async(["dmypy", "run", "--", *_MYPY_FLAGS, *paths], cwd=cwd, text=False)
+    else:
+        rc, out, err = await _run_async(["mypy", *_MYPY_FLAGS, *paths], cwd=cwd, text=False)
     if rc == 127:
         suggestions.append("Install mypy (added to requirements.txt): pip install mypy")
     else:
@@ -283,27 +765,33 @@ def _analyze_python(path: str, cwd: Optional[str]) -> Tuple[List[Dict[str, Any]]
     return issues, suggestions
 
 
-def _ts_js_eslint(file_path: str, cwd: Optional[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+@cached_tool_result("ruff", tools=("ruff",), cfg_files=("pyproject.toml", "ruff.toml", ".ruff.toml"))
+async def _ruff_file(path: str, cwd: Optional[str]) -> Tuple[List[Issue], List[str]]:
+    return await _python_ruff([path], cwd)
+
+
+async def _analyze_python(path: str, cwd: Optional[str]) -> Tuple[List[Issue], List[str]]:
+    # ruff and mypy are independent; run them concurrently.
+    # Only ruff is cached: mypy results also depend on imported modules and installed stubs.
+    (lint_issues, lint_sugg), (type_issues, type_sugg) = await asyncio.gather(
+        _ruff_file(path, cwd),
+        _python_mypy([path], cwd),
+    )
+    return lint_issues + type_issues, lint_sugg + type_sugg
+
+
+async def _ts_js_eslint(file_paths: List[str], cwd: Optional[str]) -> Tuple[List[Issue], List[str]]:
     suggestions: List[str] = []
-    issues: List[Dict[str, Any]] = []
+    issues: List[Issue] = []
 
     # Try local node_modules/.bin/eslint then npx eslint
-    node_bin = _find_upwards(os.path.dirname(file_path), "node_modules")
-    eslint_cmd_local = None
-    if node_bin:
-        maybe = os.path.join(node_bin, ".bin", "eslint")
-        if os.name == "nt":
-            maybe_cmd = maybe + ".cmd"
-            if os.path.exists(maybe_cmd):
-                eslint_cmd_local = maybe_cmd
-        if not eslint_cmd_local and os.path.exists(maybe):
-            eslint_cmd_local = maybe
+    eslint_cmd_local = _find_node_bin(os.path.dirname(file_paths[0]), "eslint")
 
     if eslint_cmd_local:
-        rc, out, err = _run([eslint_cmd_local, "-f", "json", file_path], cwd=cwd)
+        rc, out, err = await _run_async([eslint_cmd_local, "-f", "json", *file_paths], cwd=cwd, text=False)
     else:
-        # Use npx through shell so Windows resolves it
-        rc, out, err = _run("npx eslint -f json " + shlex.quote(file_path), cwd=cwd)
+        # Fall back to npx (resolved via _which, so Windows finds npx.cmd)
+        rc, out, err = await _run_async(["npx", "eslint", "-f", "json", *file_paths], cwd=cwd, text=False)
 
     if rc == 127:
         suggestions.append("Install ESLint in your JS/TS project: npm i -D eslint @typescript-eslint/parser @typescript-eslint/eslint-plugin")
@@ -314,9 +802,9 @@ def _ts_js_eslint(file_path: str, cwd: Optional[str]) -> Tuple[List[Dict[str, An
     return issues, suggestions
 
 
-def _ts_typecheck(file_dir: str, file_path: str, cwd: Optional[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+async def _ts_typecheck(file_dir: str, file_path: str, cwd: Optional[str]) -> Tuple[List[Issue], List[str]]:
     suggestions: List[str] = []
-    issues: List[Dict[str, Any]] = []
+    issues: List[Issue] = []
 
     tsconfig_dir = _find_upwards(file_dir, "tsconfig.json")
     if not tsconfig_dir:
@@ -324,112 +812,165 @@ def _ts_typecheck(file_dir: str, file_path: str, cwd: Optional[str]) -> Tuple[Li
         return issues, suggestions
 
     # Prefer local tsc if available
-    node_modules_dir = _find_upwards(tsconfig_dir, "node_modules")
-    tsc_cmd_local = None
-    if node_modules_dir:
-        maybe = os.path.join(node_modules_dir, ".bin", "tsc")
-        if os.name == "nt":
-            maybe_cmd = maybe + ".cmd"
-            if os.path.exists(maybe_cmd):
-                tsc_cmd_local = maybe_cmd
-        if not tsc_cmd_local and os.path.exists(maybe):
-            tsc_cmd_local = maybe
+    tsc_cmd_local = _find_node_bin(tsconfig_dir, "tsc")
 
+    sink = _StreamScanner(_TSC_DIAG_RE, _tsc_issue)
     if tsc_cmd_local:
-        rc, out, err = _run([tsc_cmd_local, "--noEmit", "--pretty", "false"], cwd=tsconfig_dir)
+        rc = await _run_streaming([tsc_cmd_local, "--noEmit", "--pretty", "false"], sink, cwd=tsconfig_dir)
     else:
-        rc, out, err = _run("npx tsc --noEmit --pretty false", cwd=tsconfig_dir)
+        rc = await _run_streaming(["npx", "tsc", "--noEmit", "--pretty", "false"], sink, cwd=tsconfig_dir)
 
     if rc == 127:
         suggestions.append("Install TypeScript (e.g., npm i -D typescript) and configure tsconfig.json.")
     # Parse diagnostics regardless of rc (tsc returns non-zero on errors)
-    issues.extend(_parse_tsc_output(out, err))
+    issues.extend(sink.issues)
     return issues, suggestions
 
 
-def _analyze_ts_js(path: str, cwd: Optional[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+@cached_tool_result("eslint", tools=("eslint",), cfg_files=("package.json", "package-lock.json", "eslint.config.js", ".eslintrc.json", ".eslintrc.js"))
+async def _eslint_file(path: str, cwd: Optional[str]) -> Tuple[List[Issue], List[str]]:
+    return await _ts_js_eslint([path], cwd)
+
+
+async def _analyze_ts_js(path: str, cwd: Optional[str]) -> Tuple[List[Issue], List[str]]:
     file_dir = os.path.dirname(path)
-    lint_issues, lint_sugg = _ts_js_eslint(path, cwd)
-    type_issues, type_sugg = _ts_typecheck(file_dir, path, cwd)
+    # eslint and tsc are independent; run them concurrently.
+    # Only eslint is cached: tsc checks the whole project, so other files change its result.
+    (lint_issues, lint_sugg), (type_issues, type_sugg) = await asyncio.gather(
+        _eslint_file(path, cwd),
+        _ts_typecheck(file_dir, path, cwd),
+    )
     issues = lint_issues + type_issues
     suggestions = lint_sugg + type_sugg
     return issues, suggestions
 
 
-def _analyze_java(path: str, cwd: Optional[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+async def _javac(paths: List[str], cwd: Optional[str]) -> Tuple[List[Issue], List[str]]:
     suggestions: List[str] = []
-    issues: List[Dict[str, Any]] = []
+    issues: List[Issue] = []
     # Compile with Xlint into temp dir to gather diagnostics
     with tempfile.TemporaryDirectory() as tmp:
-        rc, out, err = _run(["javac", "-Xlint", "-d", tmp, path], cwd=cwd)
+        # Hold back two lines so the caret lookahead always sees the source and caret lines
+        sink = _StreamScanner(_JAVAC_DIAG_RE, _javac_issue, holdback_lines=2)
+        rc = await _run_streaming(["javac", "-Xlint", "-d", tmp, *paths], sink, cwd=cwd)
         if rc == 127:
             suggestions.append("Install JDK (javac) to enable Java diagnostics.")
             return issues, suggestions
         # Parse diagnostics regardless of rc
-        issues.extend(_parse_javac_output(out, err))
+        issues.extend(sink.issues)
     return issues, suggestions
 
 
+async def _analyze_java(path: str, cwd: Optional[str]) -> Tuple[List[Issue], List[str]]:
+    return await _javac([path], cwd)
+
+
 # --------- Python duplicate detection via pylint R0801 ---------
 
-def _parse_pylint_json(out: str) -> List[Dict[str, Any]]:
+def _parse_pylint_json(out: bytes | str) -> List[Issue]:
     try:
-        data = json.loads(out or "[]")
-        issues: List[Dict[str, Any]] = []
+        data = orjson.loads(out or b"[]")
+        issues: List[Issue] = []
         for e in data:
             # Expect keys: "type","module","obj","line","column","path","symbol","message","message-id"
             if not isinstance(e, dict):
                 continue
-            issues.append({
-                "tool": "pylint",
-                "severity": "warning",
-                "message": e.get("message"),
-                "file": e.get("path") or e.get("filename"),
-                "line": e.get("line"),
-                "column": e.get("column"),
-                "code": e.get("message-id") or e.get("symbol"),
-            })
+            issues.append(Issue(
+                tool="pylint",
+                severity="warning",
+                message=e.get("message"),
+                file=e.get("path") or e.get("filename"),
+                line=e.get("line"),
+                column=e.get("column"),
+                code=e.get("message-id") or e.get("symbol"),
+            ))
         return issues
     except Exception:
-        return [{
-            "tool": "pylint",
-            "severity": "info",
-            "message": "Failed to parse Pylint JSON output.",
-            "raw": out,
-        }]
-
-
-def _python_config_root(start_dir: str) -> str:
-    # Prefer a directory containing pylint/pyproject config; else use start_dir
-    for marker in (".pylintrc", "pyproject.toml", "setup.cfg", "pylintrc"):
-        found = _find_upwards(start_dir, marker)
-        if found:
-            return found
-    return start_dir
-
-
-def _analyze_python_duplicates(target_file: str, cwd: Optional[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+        return [Issue(
+            tool="pylint",
+            severity="info",
+            message="Failed to parse Pylint JSON output.",
+            raw=_text(out),
+        )]
+
+
+@functools.lru_cache(maxsize=1024)
+def _py_dir_listing(path: str, mtime_ns: int) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    # (*.py files, subpackage dirs) of one directory; mtime_ns in the key drops stale listings
+    files: List[str] = []
+    subpackages: List[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".py"):
+                    files.append(entry.path)
+                elif entry.is_dir() and not entry.name.startswith(".") and os.path.isfile(os.path.join(entry.path, "__init__.py")):
+                    subpackages.append(entry.path)
+    except OSError:
+        pass
+    return tuple(sorted(files)), tuple(sorted(subpackages))
+
+
+def _python_package_files(target_file: str) -> List[str]:
+    # Files of the top-level package containing target_file (or just its directory if it is not in a package)
+    root = os.path.dirname(os.path.abspath(target_file))
+    is_package = os.path.isfile(os.path.join(root, "__init__.py"))
+    while is_package:
+        parent = os.path.dirname(root)
+        if parent == root or not os.path.isfile(os.path.join(parent, "__init__.py")):
+            break
+        root = parent
+
+    files: List[str] = []
+    pending = [root]
+    while pending:
+        cur = pending.pop()
+        try:
+            mtime_ns = os.stat(cur).st_mtime_ns
+        except OSError:
+            continue
+        py_files, subpackages = _py_dir_listing(cur, mtime_ns)
+        files.extend(py_files)
+        if is_package:
+            pending.extend(subpackages)
+    return files
+
+
+def invalidate_fs_caches() -> None:
+    """Forget memoized directory lookups; call after files are added or removed in the workspace."""
+    _FIND_UPWARDS_CACHE.clear()
+    _scan_bin_dir.cache_clear()
+    _py_dir_listing.cache_clear()
+    _MEM_CACHE.clear()
+
+
+async def _analyze_python_duplicates(target_file: str, cwd: Optional[str]) -> Tuple[List[Issue], List[str]]:
     """
-    Run pylint R0801 duplicate-code across the closest python package root (or file dir).
+    Run pylint R0801 duplicate-code across the target file's top-level package (or file dir).
     Only return entries that reference the target file to keep results relevant.
     """
     suggestions: List[str] = []
-    issues: List[Dict[str, Any]] = []
+    issues: List[Issue] = []
 
-    base_dir = _python_config_root(os.path.dirname(target_file))
-    # Run pylint against the directory to allow cross-file duplicate detection
-    cmd = ["pylint", "--disable=all", "--enable=R0801", "-f", "json", base_dir]
-    rc, out, err = _run(cmd, cwd=cwd)
+    package_files = _python_package_files(target_file)
+    if len(package_files) < 2:
+        # Nothing to compare against
+        return issues, suggestions
+    # Pass the package's files explicitly instead of the whole config root
+    cmd = ["pylint", "--disable=all", "--enable=R0801", "-f", "json", *package_files]
+    rc, out, err = await _run_async(cmd, cwd=cwd, text=False)
     if rc == 127:
         suggestions.append("Install pylint to enable Python duplicate-code detection (pip install pylint).")
         return issues, suggestions
 
     all_issues = _parse_pylint_json(out or err)
-    # Filter to only keep entries that mention the target_file path
+    # Filter to only keep entries that mention the target_file path (or its module in "==pkg.mod:[a:b]")
     target_abs = os.path.abspath(target_file)
+    module_re = re.compile(r"==(?:[\w.]*\.)?" + re.escape(os.path.splitext(os.path.basename(target_abs))[0]) + r":")
     for i in all_issues:
-        file_path = os.path.abspath(i.get("file") or "")
-        if file_path == target_abs or (i.get("message") and os.path.basename(target_abs) in i["message"]):
+        file_path = os.path.abspath(os.path.join(cwd or "", i.file or ""))
+        message = i.message or ""
+        if file_path == target_abs or module_re.search(message):
             issues.append(i)
 
     return issues, suggestions
@@ -437,32 +978,54 @@ def _analyze_python_duplicates(target_file: str, cwd: Optional[str]) -> Tuple[Li
 
 # --------- Cross-language duplicate detection via jscpd ---------
 
-def _find_node_bin(start_dir: str, bin_name: str) -> Optional[str]:
-    node_root = _find_upwards(start_dir, "node_modules")
-    if not node_root:
-        return None
-    candidate = os.path.join(node_root, ".bin", bin_name)
-    if os.name == "nt":
-        if os.path.exists(candidate + ".cmd"):
-            return candidate + ".cmd"
-    return candidate if os.path.exists(candidate) else None
-
-
-def _analyze_jscpd_for_file(file_path: str, cwd: Optional[str]) -> Tuple[List[Dict[str, Any]], List[str]]:
+_JSCPD_EXTENSIONS = (".py", ".ts", ".tsx", ".js", ".jsx", ".java")
+_JSCPD_SKIP_DIRS = {"node_modules", ".git"}
+
+
+def _jscpd_scope_key(base_dir: str) -> str:
+    # Hash of every (path, mtime_ns, size) jscpd would scan; any edit, add or delete changes it
+    entries: List[Tuple[str, int, int]] = []
+    pending = [base_dir]
+    while pending:
+        cur = pending.pop()
+        try:
+            with os.scandir(cur) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _JSCPD_SKIP_DIRS:
+                            pending.append(entry.path)
+                    elif entry.name.endswith(_JSCPD_EXTENSIONS):
+                        st = entry.stat()
+                        entries.append((entry.path, st.st_mtime_ns, st.st_size))
+        except OSError:
+            continue
+    entries.sort()
+    return _hash_bytes(*(f"{p}\0{m}\0{n}\n".encode("utf-8") for p, m, n in entries)).hex()
+
+
+async def _analyze_jscpd_for_file(file_path: str, cwd: Optional[str]) -> Tuple[List[Issue], List[str]]:
     """
     Run jscpd in the nearest workspace (cwd or file dir). Return issues that involve the target file.
+    Results are cached on disk until a file in the scanned subtree changes.
     """
     suggestions: List[str] = []
-    issues: List[Dict[str, Any]] = []
+    issues: List[Issue] = []
 
     base_dir = cwd or os.path.dirname(os.path.abspath(file_path))
+    scope_key = _jscpd_scope_key(base_dir)
+    entry_path = _lint_cache_entry_path("jscpd", os.path.abspath(file_path), base_dir)
+    record = _lint_cache_load(entry_path)
+    if record is not None and record.get("key") == scope_key:
+        os.utime(entry_path)
+        return [Issue.from_dict(d) for d in record["issues"]], record["suggestions"]
+
     local_jscpd = _find_node_bin(base_dir, "jscpd")
 
     if local_jscpd:
-        rc, out, err = _run([local_jscpd, "--silent", "--reporters", "json", "--pattern", "**/*.{py,ts,tsx,js,jsx,java}"], cwd=base_dir, timeout=180)
+        rc, out, err = await _run_async([local_jscpd, "--silent", "--reporters", "json", "--pattern", "**/*.{py,ts,tsx,js,jsx,java}"], cwd=base_dir, timeout=180, text=False)
     else:
         # Use npx as a fallback
-        rc, out, err = _run('npx jscpd --silent --reporters json --pattern "**/*.{py,ts,tsx,js,jsx,java}"', cwd=base_dir, timeout=180)
+        rc, out, err = await _run_async(["npx", "jscpd", "--silent", "--reporters", "json", "--pattern", "**/*.{py,ts,tsx,js,jsx,java}"], cwd=base_dir, timeout=180, text=False)
 
     if rc == 127:
         suggestions.append("Install jscpd in your project to enable cross-language duplicate detection: npm i -D jscpd")
@@ -470,9 +1033,11 @@ def _analyze_jscpd_for_file(file_path: str, cwd: Optional[str]) -> Tuple[List[Di
 
     # Parse JSON
     try:
-        data = json.loads(out or err or "{}")
+        data = orjson.loads(out or err or b"{}")
         dups = data.get("duplicates", []) or []
         target_abs = os.path.abspath(file_path)
+        # Each file shows up in many duplicate groups; normalize every distinct name once
+        resolved: Dict[str, str] = {}
 
         for dup in dups:
             # dup example fields: "format","lines","tokens","fragment","firstFile","secondFile" in older versions or "files": [{name,start,end},...]
@@ -491,8 +1056,11 @@ def _analyze_jscpd_for_file(file_path: str, cwd: Optional[str]) -> Tuple[List[Di
                 name = f.get("name") or f.get("file") or f.get("path")
                 if not name:
                     continue
+                abs_name = resolved.get(name)
+                if abs_name is None:
+                    abs_name = resolved[name] = os.path.abspath(os.path.join(base_dir, name))
                 norm_files.append({
-                    "name": os.path.abspath(name),
+                    "name": abs_name,
                     "start": f.get("start", f.get("startLine")),
                     "end": f.get("end", f.get("endLine")),
                 })
@@ -508,23 +1076,49 @@ def _analyze_jscpd_for_file(file_path: str, cwd: Optional[str]) -> Tuple[List[Di
             for ff in norm_files:
                 if ff["name"] != target_abs:
                     # Report an issue for the target pointing to the duplicate counterpart
-                    issues.append({
-                        "tool": "jscpd",
-                        "severity": "warning",
-                        "message": f"Duplicate code detected ({dup.get('format','?')}, {dup.get('lines','?')} lines) also found in {ff['name']}",
-                        "file": target_abs,
-                        "line": ff.get("start"),
-                        "endLine": ff.get("end"),
-                        "code": "jscpd-duplicate",
-                    })
+                    issues.append(Issue(
+                        tool="jscpd",
+                        severity="warning",
+                        message=f"Duplicate code detected ({dup.get('format','?')}, {dup.get('lines','?')} lines) also found in {ff['name']}",
+                        file=target_abs,
+                        line=ff.get("start"),
+                        end_line=ff.get("end"),
+                        code="jscpd-duplicate",
+                    ))
     except Exception:
         suggestions.append("Failed to parse jscpd output; ensure jscpd is installed and up-to-date.")
+        return issues, suggestions
 
+    _lint_cache_store(entry_path, {
+        "key": scope_key,
+        "created": time.time(),
+        "issues": [i.to_dict() for i in issues],
+        "suggestions": suggestions,
+    })
     return issues, suggestions
 
 
+def _is_duplicate_worth_scanning(path: str, min_bytes: int, min_lines: int) -> bool:
+    # Cross-file duplicates almost never involve tiny files; skip the expensive pylint/jscpd passes for them
+    try:
+        if os.path.getsize(path) < min_bytes:
+            return False
+        if min_lines <= 0:
+            return True
+        with open(path, "rb") as f:
+            return f.read().count(b"\n") + 1 >= min_lines
+    except OSError:
+        return True
+
+
 @tool("analyze_code_quality", args_schema=AnalyzeInput)
-def analyze_code_quality(file_path: str, cwd: Optional[str] = None, language: Optional[str] = None) -> dict:
+def analyze_code_quality(
+    file_path: str,
+    cwd: Optional[str] = None,
+    language: Optional[str] = None,
+    dup_min_bytes: int = 2048,
+    dup_min_lines: int = 50,
+) -> dict:
     """
     Analyze a single file for errors, types, unused variables, duplicates, etc.
     Automatically picks analyzers based on language.
@@ -538,6 +1132,18 @@ def analyze_code_quality(file_path: str, cwd: Optional[str] = None, language: Op
         "analyzers": [ "ruff", "mypy", "eslint", "tsc", "javac", "pylint", "jscpd", ... ]
       }
     """
+    return _run_coroutine(_analyze_code_quality(file_path, cwd, language, dup_min_bytes, dup_min_lines))
+
+
+# Tier-1 cache: last result per (path, mtime_ns, size, options), checked before any analyzer or hashing.
+# Keyed on the target file only; results that depend on other files are refreshed once the target changes.
+async def _analyze_code_quality(
+    file_path: str,
+    cwd: Optional[str] = None,
+    language: Optional[str] = None,
+    dup_min_bytes: int = 2048,
+    dup_min_lines: int = 50,
+) -> dict:
     try:
         abs_path = _norm_path(file_path, cwd)
         effective_cwd = os.path.abspath(cwd) if cwd else _workspace_root()
@@ -548,42 +1154,116 @@ def analyze_code_quality(file_path: str, cwd: Optional[str] = None, language: Op
         if not lang:
             return {"success": False, "error": f"Unsupported file type for: {abs_path}"}
 
-        issues: List[Dict[str, Any]] = []
+        issues: List[Issue] = []
         suggestions: List[str] = []
+        scan_duplicates = _is_duplicate_worth_scanning(abs_path, dup_min_bytes, dup_min_lines)
 
         # Language-specific analyzers
         if lang == "python":
-            i, s = _analyze_python(abs_path, effective_cwd)
-            issues.extend(i); suggestions.extend(s)
-            # Python duplicate detection (R0801)
-            dup_i, dup_s = _analyze_python_duplicates(abs_path, effective_cwd)
-            issues.extend(dup_i); suggestions.extend(dup_s)
+            analyzers = [_analyze_python(abs_path, effective_cwd)]
+            if scan_duplicates:
+                # Python duplicate detection (R0801)
+                analyzers.append(_analyze_python_duplicates(abs_path, effective_cwd))
         elif lang in ("typescript", "javascript"):
-            i, s = _analyze_ts_js(abs_path, effective_cwd)
-            issues.extend(i); suggestions.extend(s)
+            analyzers = [_analyze_ts_js(abs_path, effective_cwd)]
         elif lang == "java":
-            i, s = _analyze_java(abs_path, effective_cwd)
-            issues.extend(i); suggestions.extend(s)
+            analyzers = [_analyze_java(abs_path, effective_cwd)]
         else:
             return {"success": False, "error": f"Language not supported: {lang}"}
 
         # Cross-language duplicate detection (only on the local subtree; filter to target file)
-        j_i, j_s = _analyze_jscpd_for_file(abs_path, effective_cwd)
-        issues.extend(j_i); suggestions.extend(j_s)
+        if scan_duplicates:
+            analyzers.append(_analyze_jscpd_for_file(abs_path, effective_cwd))
 
-        # Sort issues by severity heuristic
-        severity_order = {"error": 0, "failure": 0, "warning": 1, "info": 2}
-        issues.sort(key=lambda x: (severity_order.get(str(x.get("severity")).lower(), 3), (x.get("file") or ""), x.get("line") or 0, x.get("column") or 0))
+        # All analyzer families are independent subprocess runs; overlap them
+        for i, s in await asyncio.gather(*analyzers):
+            issues.extend(i); suggestions.extend(s)
 
-        return {
-            "success": True,
-            "language": lang,
-            "issues": issues,
-            "suggestions": suggestions,
-            "analyzers": sorted(list({i.get("tool") for i in issues if i.get("tool")})),
-        }
+        return _quality_result(lang, issues, suggestions)
     except Exception as e:
         return {"success": False, "error": f"Code quality analysis failed: {str(e)}"}
+
+
+def _quality_result(lang: str, issues: List[Issue], suggestions: List[str]) -> dict:
+    # Sort issues by severity heuristic, then location
+    issues.sort(key=operator.attrgetter("sort_key"))
+
+    return {
+        "success": True,
+        "language": lang,
+        "issues": [i.to_dict() for i in issues],
+        "suggestions": suggestions,
+        "analyzers": sorted(list({i.tool for i in issues if i.tool})),
+    }
+
+
+def analyze_batch(paths: List[str], cwd: Optional[str] = None) -> Dict[str, dict]:
+    """
+    Lint/type-check many files with one analyzer invocation per language instead of one per file.
+    Duplicate detection (pylint R0801, jscpd) is not run; use analyze_code_quality for that.
+
+    Returns a dict keyed by resolved absolute path, each value shaped like analyze_code_quality's result.
+    """
+    return _run_coroutine(_analyze_batch(paths, cwd))
+
+
+async def _analyze_batch(paths: List[str], cwd: Optional[str] = None) -> Dict[str, dict]:
+    effective_cwd = os.path.abspath(cwd) if cwd else _workspace_root()
+    results: Dict[str, dict] = {}
+    buckets: Dict[str, List[str]] = {}
+    for file_path in paths:
+        abs_path = _norm_path(file_path, cwd)
+        if not os.path.exists(abs_path):
+            results[abs_path] = {"success": False, "error": f"File not found: {file_path} (resolved: {abs_path})"}
+            continue
+        lang = _detect_language(abs_path, None)
+        if not lang:
+            results[abs_path] = {"success": False, "error": f"Unsupported file type for: {abs_path}"}
+            continue
+        buckets.setdefault("typescript" if lang == "javascript" else lang, []).append(abs_path)
+
+    # One invocation per tool per bucket; eslint runs once per node_modules project and tsc once per
+    # tsconfig project. Each job carries the directory its tool reports relative paths against.
+    jobs: List[Tuple[List[str], str, Any]] = []
+    py_paths = buckets.get("python", [])
+    if py_paths:
+        jobs.append((py_paths, effective_cwd, _python_ruff(py_paths, effective_cwd)))
+        jobs.append((py_paths, effective_cwd, _python_mypy(py_paths, effective_cwd)))
+    ts_paths = buckets.get("typescript", [])
+    if ts_paths:
+        eslint_projects: Dict[Optional[str], List[str]] = {}
+        tsc_projects: Dict[Optional[str], List[str]] = {}
+        for p in ts_paths:
+            eslint_projects.setdefault(_find_upwards(os.path.dirname(p), "node_modules"), []).append(p)
+            tsc_projects.setdefault(_find_upwards(os.path.dirname(p), "tsconfig.json"), []).append(p)
+        for project_paths in eslint_projects.values():
+            jobs.append((project_paths, effective_cwd, _ts_js_eslint(project_paths, effective_cwd)))
+        for tsconfig_dir, project_paths in tsc_projects.items():
+            # tsc runs in the tsconfig directory, so its file names are relative to it
+            jobs.append((project_paths, tsconfig_dir or effective_cwd, _ts_typecheck(os.path.dirname(project_paths[0]), project_paths[0], effective_cwd)))
+    java_paths = buckets.get("java", [])
+    if java_paths:
+        jobs.append((java_paths, effective_cwd, _javac(java_paths, effective_cwd)))
+
+    outputs = await asyncio.gather(*(job for _, _, job in jobs))
+
+    # Split the combined reports back into per-file buckets
+    per_file_issues: Dict[str, List[Issue]] = {p: [] for ps in buckets.values() for p in ps}
+    per_file_suggestions: Dict[str, List[str]] = {p: [] for p in per_file_issues}
+    for (job_paths, base_dir, _), (issues, suggestions) in zip(jobs, outputs):
+        for p in job_paths:
+            per_file_suggestions[p].extend(suggestions)
+        for issue in issues:
+            file_name = issue.file
+            if not file_name:
+                continue
+            owner = os.path.abspath(os.path.join(base_dir, file_name))
+            if owner in per_file_issues:
+                per_file_issues[owner].append(issue)
+
+    for p, issues in per_file_issues.items():
+        results[p] = _quality_result(_detect_language(p, None), issues, per_file_suggestions[p])
+    return results
 # --------- Optional project setup helper for JS/TS projects (ESLint + tsconfig) ---------
 from pydantic import BaseModel
 
@@ -673,6 +1353,10 @@ export default [
         else:
             skipped.append(eslint_path)
 
+        if created:
+            # New config files change what the upward lookups should find
+            invalidate_fs_caches()
+
         return {
             "success": True,
             "frontend_root": frontend_root,
@@ -1,27 +1,316 @@
 # Import Pydantic for schema definition
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Callable, Optional
+from dataclasses import dataclass
 from langchain_core.tools import tool
-from composio import Composio
+from collections import OrderedDict
+from collections.abc import Mapping
+from types import MappingProxyType
+from threading import RLock
+import asyncio
+import atexit
+import functools
+import itertools
+import logging
+import operator
+import re
 import time
 import shutil
 import os
-from composio_langchain import LangchainProvider
-from dotenv import load_dotenv
-load_dotenv()
+
+try:
+    import orjson
+except ImportError:
+    import json as orjson
+# Deployments usually set the environment directly; only look for a .env file when it is missing
+if not (os.getenv('COMPOSIO_API_KEY') and os.getenv('COMPOSIO_USER_ID')):
+    from dotenv import load_dotenv
+    load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Agents bind the decorated filtered_composio_* tools. Python-side callers should use the bare
+# filtered_*_search functions, which skip LangChain's argument validation and message packaging.
+__all__ = [
+    "filtered_image_search",
+    "filtered_google_search",
+    "filtered_google_maps_search",
+    "filtered_news_search",
+    "filtered_shopping_search",
+    "filtered_flight_search",
+    "filtered_hotel_search",
+    "afiltered_image_search",
+    "afiltered_google_search",
+    "afiltered_google_maps_search",
+    "afiltered_news_search",
+    "afiltered_shopping_search",
+    "afiltered_flight_search",
+    "afiltered_hotel_search",
+    "filtered_multi_search",
+    "filtered_flight_search_many",
+    "filtered_hotel_search_many",
+    "clear_search_caches",
+    "FilterSpec",
+    "FILTER_SPECS",
+    "agenerate_and_pull_video",
+    "generate_and_pull_video",
+    "agenerate_video",
+    "generate_video",
+    "filtered_composio_image_search",
+    "filtered_composio_google_search",
+    "filtered_composio_google_maps_search",
+    "filtered_composio_news_search",
+    "filtered_composio_shopping_search",
+    "filtered_composio_flight_search",
+    "filtered_composio_hotel_search",
+]
 
 
 # Get Composio tools
-composio = Composio(api_key=os.getenv('COMPOSIO_API_KEY'), allow_tracking=False, timeout=60, provider=LangchainProvider())
-image_search_tools = composio.tools.get(user_id=os.getenv('COMPOSIO_USER_ID'), tools=["COMPOSIO_SEARCH_IMAGE_SEARCH"])
-google_search = composio.tools.get(user_id=os.getenv('COMPOSIO_USER_ID'), tools=["COMPOSIO_SEARCH_SEARCH"])
-google_maps_search = composio.tools.get(user_id=os.getenv('COMPOSIO_USER_ID'), tools=["COMPOSIO_SEARCH_GOOGLE_MAPS_SEARCH"])
-news_search_tools = composio.tools.get(user_id=os.getenv('COMPOSIO_USER_ID'), tools=["COMPOSIO_SEARCH_NEWS_SEARCH"])
-shopping_tools = composio.tools.get(user_id=os.getenv('COMPOSIO_USER_ID'), tools=["COMPOSIO_SEARCH_SHOPPING_SEARCH"])
-flight_search = composio.tools.get(user_id=os.getenv('COMPOSIO_USER_ID'), tools=["COMPOSIO_SEARCH_FLIGHTS"])
-hotel_search = composio.tools.get(user_id=os.getenv('COMPOSIO_USER_ID'), tools=["COMPOSIO_SEARCH_HOTELS"])
-video_generation_tool = composio.tools.get(user_id=os.getenv('COMPOSIO_USER_ID'), tools=["GEMINI_GENERATE_VIDEOS"])
-video_url_pull_tool = composio.tools.get(user_id=os.getenv('COMPOSIO_USER_ID'), tools=["GEMINI_WAIT_FOR_VIDEO"])
+_SEARCH_TOOL_NAMES = (
+    "COMPOSIO_SEARCH_IMAGE_SEARCH",
+    "COMPOSIO_SEARCH_SEARCH",
+    "COMPOSIO_SEARCH_GOOGLE_MAPS_SEARCH",
+    "COMPOSIO_SEARCH_NEWS_SEARCH",
+    "COMPOSIO_SEARCH_SHOPPING_SEARCH",
+)
+
+# The SDK import, client construction and tool listing are deferred to the first tool call, so
+# processes that never use these tools don't pay for them at import.
+@functools.cache
+def _client():
+    from composio import Composio
+    from composio_langchain import LangchainProvider
+    # Every tool call goes through this one client, whose HTTP layer keeps a single pooled keep-alive
+    # httpx.Client, so repeated and concurrent calls reuse connections instead of new TCP/TLS handshakes
+    client = Composio(api_key=os.getenv('COMPOSIO_API_KEY'), allow_tracking=False, timeout=60, provider=LangchainProvider())
+    atexit.register(client.client.close)
+    return client
+
+
+@functools.cache
+def _tools_by_name() -> dict:
+    # Every tool this module uses is fetched in a single round trip and keyed by name,
+    # so lookups are a dict get rather than a scan for the first matching entry
+    return {tool_item.name: tool_item for tool_item in _client().tools.get(user_id=os.getenv('COMPOSIO_USER_ID'), tools=[
+        *_SEARCH_TOOL_NAMES,
+        "COMPOSIO_SEARCH_FLIGHTS",
+        "COMPOSIO_SEARCH_HOTELS",
+        "GEMINI_GENERATE_VIDEOS",
+        "GEMINI_WAIT_FOR_VIDEO",
+    ])}
+
+
+def _decode_raw(result):
+    # Some tool/provider versions hand back the response as JSON text; decode it with orjson in one C pass
+    if isinstance(result, (bytes, bytearray, memoryview, str)):
+        try:
+            return orjson.loads(result)
+        except orjson.JSONDecodeError:
+            return result
+    return result
+
+
+def _make_invoker(raw_tool):
+    # Prefer the tool's invoke method; fall back to calling its function with keyword arguments
+    if hasattr(raw_tool, 'invoke'):
+        invoke = raw_tool.invoke
+    else:
+        invoke = lambda payload: raw_tool.func(**payload)
+    return lambda payload: _decode_raw(invoke(payload))
+
+
+@functools.cache
+def _invokers() -> dict:
+    # Choose invoke/func once per tool instead of probing attributes on every call
+    return {name: _make_invoker(tool_item) for name, tool_item in _tools_by_name().items()}
+
+
+# -------------------------------------- Search result cache --------------------------------------
+
+SEARCH_CACHE_MAX_ENTRIES = 512
+SEARCH_CACHE_TTL_SECONDS = 600
+# Error results ("tool not found", "no results", bad response shape) are remembered briefly so
+# error storms don't multiply upstream load; raised exceptions are likely transient and never cached
+NEGATIVE_CACHE_MAX_ENTRIES = 256
+NEGATIVE_CACHE_TTL_SECONDS = 30
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire after `ttl` seconds."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = RLock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+_SEARCH_CACHES = []
+
+
+def _clone_json(value):
+    # Filtered results are plain JSON-shaped dicts/lists, so a structural copy is enough and far
+    # cheaper than copy.deepcopy's memo bookkeeping; scalars and read-only error proxies are shared as-is
+    if isinstance(value, dict):
+        return {key: _clone_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clone_json(item) for item in value]
+    return value
+
+
+def _cached_search(fn):
+    """Cache results of a search wrapper by normalized query and remaining arguments."""
+    cache = _TTLCache(SEARCH_CACHE_MAX_ENTRIES, SEARCH_CACHE_TTL_SECONDS)
+    negative_cache = _TTLCache(NEGATIVE_CACHE_MAX_ENTRIES, NEGATIVE_CACHE_TTL_SECONDS)
+    _SEARCH_CACHES.extend((cache, negative_cache))
+
+    @functools.wraps(fn)
+    def wrapper(query: str, *args, **kwargs):
+        key = (str(query).strip().lower(), args, tuple(sorted(kwargs.items())))
+        cached = cache.get(key)
+        if cached is None:
+            cached = negative_cache.get(key)
+        if cached is not None:
+            # Hand out copies so callers can't mutate the cached result
+            return _clone_json(cached)
+        result = fn(query, *args, **kwargs)
+        if isinstance(result, Mapping):
+            if result.get("successful"):
+                cache.set(key, _clone_json(result))
+            elif not str(result.get("error", "")).startswith("Tool execution failed"):
+                negative_cache.set(key, _clone_json(result))
+        return result
+
+    return wrapper
+
+
+# Flight and hotel responses are cached before filtering, so the same trip asked for with a different
+# flight_type or include_* flags still shares one upstream call; fares move, so entries expire sooner
+TRAVEL_CACHE_MAX_ENTRIES = 512
+TRAVEL_CACHE_TTL_SECONDS = 300
+_TRAVEL_CACHE = _TTLCache(TRAVEL_CACHE_MAX_ENTRIES, TRAVEL_CACHE_TTL_SECONDS)
+_SEARCH_CACHES.append(_TRAVEL_CACHE)
+
+
+def _cached_invoke(tool_name: str, invoke: Callable, tool_input: dict):
+    """Call `invoke(tool_input)`, reusing a recent raw response for identical input."""
+    key = (tool_name, tuple(sorted(tool_input.items())))
+    cached = _TRAVEL_CACHE.get(key)
+    if cached is not None:
+        # The extractors reuse nested values in their output; hand out copies so callers can't mutate the entry
+        return _clone_json(cached)
+    result = invoke(tool_input)
+    # Only well-formed responses are kept; exceptions propagate and are never cached
+    if isinstance(result, dict) and "data" in result:
+        _TRAVEL_CACHE.set(key, _clone_json(result))
+    return result
+
+
+def clear_search_caches():
+    """Drop all cached search results."""
+    for cache in _SEARCH_CACHES:
+        cache.clear()
+
+# -------------------------------------- Result key sets --------------------------------------
+
+# Keys kept per result item; `item.keys() & KEYS` intersects in C and only yields keys the item actually has
+_IMAGE_KEYS = frozenset(("link", "original"))
+_VIDEO_KEYS = frozenset(("channel", "link", "platform", "title"))
+_ORGANIC_KEYS = frozenset(("date", "link", "snippet", "source", "title"))
+_NEWS_FIELDS = ("date", "link", "published_at", "snippet", "title")
+_NEWS_KEYS = frozenset(_NEWS_FIELDS)
+_SHOPPING_KEYS = frozenset(("old_price", "price", "rating", "tag", "thumbnail", "title", "delivery"))
+_PLACE_KEYS = frozenset((
+    "title", "type", "address", "phone", "rating", "reviews",
+    "description", "amenities", "gps_coordinates", "rating_summary"
+))
+_REVIEW_KEYS = frozenset(("date", "description", "rating", "username"))
+
+# Key sets whose items nearly always carry every key: one C-level itemgetter call per item instead of
+# the intersection, which stays as the fallback for items missing a key
+_DENSE_GETTERS = {
+    _NEWS_KEYS: (_NEWS_FIELDS, operator.itemgetter(*_NEWS_FIELDS)),
+}
+
+# Shared default for `.get("results", _EMPTY).get(...)` chains; never mutate
+_EMPTY: dict = {}
+
+
+@functools.lru_cache(maxsize=None)
+def _error(message: str) -> MappingProxyType:
+    """Shared read-only error result for a fixed message (dynamic messages keep building plain dicts)."""
+    return MappingProxyType({"error": message, "successful": False})
+
+
+def _extract(value, *path):
+    """Follow `path` through nested dicts; None as soon as a level is missing or not a dict."""
+    for key in path:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _project(node: dict, keys: frozenset) -> dict:
+    """Keep only `keys` of `node`, skipping the ones it doesn't have."""
+    return {key: node[key] for key in node.keys() & keys}
+
+
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _date_error(**dates) -> Optional[MappingProxyType]:
+    """Error result for the first given date not in YYYY-MM-DD format (empty ones are skipped), else None."""
+    for name, value in dates.items():
+        if value and not (isinstance(value, str) and _DATE_RE.fullmatch(value)):
+            return _error(f"{name} must be a date in YYYY-MM-DD format")
+    return None
+
+
+# Result arrays are type-checked once; malformed (non-dict) items inside them are skipped
+def _project_dense(item, keys: frozenset, fields: tuple, get) -> dict:
+    try:
+        return dict(zip(fields, get(item)))
+    except (KeyError, TypeError):
+        return {key: item[key] for key in item.keys() & keys}
+
+
+def _project_items(items, keys: frozenset) -> list:
+    dense = _DENSE_GETTERS.get(keys)
+    if dense is None:
+        return [{key: item[key] for key in item.keys() & keys} for item in items if isinstance(item, dict)]
+    fields, get = dense
+    return [_project_dense(item, keys, fields, get) for item in items if isinstance(item, dict)]
+
+
+def _filter_items(items: list, keys: frozenset, limit: int) -> list:
+    """Keep only `keys` of the first `limit` dict items; order is preserved."""
+    # Stream straight from the source list instead of slicing a copy first
+    return _project_items(itertools.islice(items, limit), keys)
 
 # -------------------------------------- Video Generation Tool --------------------------------------
 
@@ -32,31 +321,33 @@ class VideoGenerationInput(BaseModel):
     model: str = Field(default="veo-3.0-generate-preview", description="Model to use. Examples: 'veo-3.0-generate-preview', 'veo-3.0-fast-generate-preview', 'veo-2.0-generate-001'")
     filename: str = Field(default=None, description="Name for the generated video file (without extension)")
 
+# Polling schedule for the generated video: check early, then back off and cap (about 70 seconds in total)
+VIDEO_POLL_DELAYS = (4, 4, 6, 8, 10, 12, 12, 12)
+
+def _move_video(src: str, dst: str) -> None:
+    # A rename is a single syscall on the same filesystem; across filesystems copyfile uses the
+    # kernel's zero-copy path (sendfile on Linux) and skips copy2's metadata copy
+    try:
+        os.replace(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
 # Custom wrapper for video generation and pulling
-def generate_and_pull_video(prompt: str, filename: str = None, model: str = "veo-3.0-generate-preview", extras: object = None) -> str:
-    """Wrapper that handles video generation, waiting, pulling, and file management"""
-    # Get the raw tools
-    raw_gen_tool = None
-    raw_pull_tool = None
-    
-    for tool_item in video_generation_tool:
-        if tool_item.name == "GEMINI_GENERATE_VIDEOS":
-            raw_gen_tool = tool_item
-            break
-            
-    for tool_item in video_url_pull_tool:
-        if tool_item.name == "GEMINI_WAIT_FOR_VIDEO":
-            raw_pull_tool = tool_item
-            break
+async def agenerate_and_pull_video(prompt: str, filename: str = None, model: str = "veo-3.0-generate-preview", extras: object = None) -> str:
+    """Wrapper that handles video generation, waiting, pulling, and file management.
+    Waits with asyncio.sleep and runs the blocking Composio calls in worker threads, so other work keeps running."""
+    try:
+        # Get the raw tools (the first lookup lists them over the network, so it is guarded too)
+        invokers = _invokers()
+        invoke_gen = invokers.get("GEMINI_GENERATE_VIDEOS")
+        invoke_pull = invokers.get("GEMINI_WAIT_FOR_VIDEO")
             
-    if not raw_gen_tool or not raw_pull_tool:
-        error_msg = "Required video tools not found"
-        print(f"❌ Error: {error_msg}")
-        return error_msg
+        if not invoke_gen or not invoke_pull:
+            error_msg = "Required video tools not found"
+            logger.error("Error: %s", error_msg)
+            return error_msg
         
-    try:
-        print(f"🎬 Generating video for: '{prompt}'")
-        print("⏳ Please wait, this may take a few minutes...")
+        logger.info("Generating video for: '%s'", prompt)
         
         # Step 1: Generate video and get operation_name
         gen_input = {
@@ -66,34 +357,27 @@ def generate_and_pull_video(prompt: str, filename: str = None, model: str = "veo
         if extras:
             gen_input["extras"] = extras
             
-        if hasattr(raw_gen_tool, 'invoke'):
-            gen_result = raw_gen_tool.invoke(gen_input)
-        else:
-            gen_result = raw_gen_tool.func(**gen_input)
+        gen_result = await asyncio.to_thread(invoke_gen, gen_input)
             
         if not isinstance(gen_result, dict) or "data" not in gen_result or "operation_name" not in gen_result["data"]:
             error_msg = "Invalid response from video generation"
-            print(f"❌ Error: {error_msg}")
-            print(f"Received response: {gen_result}")
+            logger.error("Error: %s", error_msg)
+            logger.debug("Received response: %r", gen_result)
             return error_msg
             
         operation_id = gen_result["data"]["operation_name"]
-        print("🎥 Video generation started...")
-        
-        time.sleep(12)  # Wait 12 seconds for the video to be ready before pulling it
+        logger.info("Video generation started (operation %s)", operation_id)
 
-        # Step 2: Pull video with retries
-        max_retries = 6  # Maximum 6 retries (total 60 seconds)
-        for attempt in range(max_retries):
+        # Step 2: Pull video, waiting before each attempt
+        max_retries = len(VIDEO_POLL_DELAYS)
+        for attempt, delay in enumerate(VIDEO_POLL_DELAYS):
+            await asyncio.sleep(delay)
             try:
-                if hasattr(raw_pull_tool, 'invoke'):
-                    pull_result = raw_pull_tool.invoke({"operation_name": operation_id})
-                else:
-                    pull_result = raw_pull_tool.func(operation_name=operation_id)
+                pull_result = await asyncio.to_thread(invoke_pull, {"operation_name": operation_id})
                 
                 if isinstance(pull_result, dict) and "data" in pull_result and "video_file" in pull_result["data"]:
                     original_path = pull_result["data"]["video_file"]
-                    print(f"✅ Video pulled successfully: {original_path}")
+                    logger.info("Video pulled successfully: %s", original_path)
                     
                     # Step 3: Move to uploaded_files with custom filename
                     base_filename = filename if filename else f"video_{int(time.time())}"
@@ -107,41 +391,131 @@ def generate_and_pull_video(prompt: str, filename: str = None, model: str = "veo
                     # Create full file path
                     file_path = os.path.join(upload_dir, final_filename)
                     
-                    # Copy the file to uploaded_files
-                    shutil.copy2(original_path, file_path)
+                    # Move the file to uploaded_files
+                    await asyncio.to_thread(_move_video, original_path, file_path)
                     
-                    print(f"✅ Video saved successfully as '{file_path}'!")
+                    logger.info("Video saved as '%s'", file_path)
                     return file_path
                 
                 # If we get here, the video isn't ready yet
-                if attempt < max_retries - 1:  # Don't sleep on the last attempt
-                    print(f"⏳ Video not ready yet, waiting... (attempt {attempt + 1}/{max_retries})")
-                    time.sleep(10)  # Wait 10 seconds before next attempt
+                if attempt < max_retries - 1:
+                    logger.debug("Video not ready yet (attempt %d/%d)", attempt + 1, max_retries)
                     
             except Exception as e:
-                if attempt < max_retries - 1:  # Don't sleep on the last attempt
-                    print(f"⚠️ Attempt {attempt + 1} failed, retrying...")
-                    time.sleep(10)  # Wait 10 seconds before next attempt
+                if attempt < max_retries - 1:
+                    logger.warning("Video pull attempt %d failed, retrying: %s", attempt + 1, e)
                 else:
                     error_msg = f"Failed to pull video after multiple attempts: {str(e)}"
-                    print(f"❌ Error: {error_msg}")
+                    logger.error("Error: %s", error_msg)
                     return error_msg
                     
         error_msg = "Failed to pull video after maximum retries"
-        print(f"❌ Error: {error_msg}")
+        logger.error("Error: %s", error_msg)
         return error_msg
         
     except Exception as e:
         error_msg = f"Tool execution failed: {str(e)}"
-        print(f"❌ Error: {error_msg}")
+        logger.error("Error: %s", error_msg)
         return error_msg
 
+
+def generate_and_pull_video(prompt: str, filename: str = None, model: str = "veo-3.0-generate-preview", extras: object = None) -> str:
+    """Blocking entry point for callers without an event loop."""
+    return asyncio.run(agenerate_and_pull_video(prompt=prompt, filename=filename, model=model, extras=extras))
+
+
+async def agenerate_video(prompt: str, filename: str = None, model: str = "veo-3.0-generate-preview", extras: object = None) -> str:
+    """Generates videos from text prompts using Google's Veo models. Creates high-quality video content."""
+    return await agenerate_and_pull_video(prompt=prompt, filename=filename, model=model, extras=extras)
+
 # Create the custom tool
 @tool("generate_video", args_schema=VideoGenerationInput, return_direct=True)
 def generate_video(prompt: str, filename: str = None, model: str = "veo-3.0-generate-preview", extras: object = None) -> str:
     """Generates videos from text prompts using Google's Veo models. Creates high-quality video content."""
     return generate_and_pull_video(prompt=prompt, filename=filename, model=model, extras=extras)
 
+# Async agents (ainvoke) poll without tying up a worker thread for the whole wait
+generate_video.coroutine = agenerate_video
+
+
+# -------------------------------------- Tool output serialization --------------------------------------
+
+# LangChain would stringify the tools' dict results with stdlib json; hand it orjson's string instead
+def _json_default(value):
+    # Read-only error results are MappingProxyType, which neither encoder handles natively
+    if isinstance(value, MappingProxyType):
+        return dict(value)
+    return str(value)
+
+
+def _tool_json(result) -> str:
+    encoded = orjson.dumps(result, default=_json_default)
+    return encoded.decode() if isinstance(encoded, bytes) else encoded
+
+
+def _json_coroutine(afn):
+    @functools.wraps(afn)
+    async def run(*args, **kwargs) -> str:
+        return _tool_json(await afn(*args, **kwargs))
+    return run
+
+# -------------------------------------- Filtered search runner --------------------------------------
+
+@dataclass(frozen=True, slots=True)
+class FilterSpec:
+    """How one Composio search tool is called and how its response is trimmed."""
+    tool: str
+    # (results key, keys to keep) pairs; each list is sliced to num_results and projected
+    sections: tuple = ()
+    max_results: int = 10
+    missing_error: str = ""
+    payload_key: str = "query"
+    # Custom extraction from result["data"] for responses that aren't flat result lists
+    extract: Optional[Callable[[dict, int], dict]] = None
+
+
+def _success(results: dict) -> dict:
+    # The one place the success envelope is built; a single nested literal is the cheapest way to make it
+    return {"data": {"results": results}, "successful": True}
+
+
+def _extract_sections(spec: FilterSpec, data: dict, num_results: int) -> dict:
+    try:
+        results = data["results"]
+    except (KeyError, TypeError):
+        results = _EMPTY
+    filtered_results = {}
+    for out_key, keys in spec.sections:
+        items = results.get(out_key)
+        if items is None:
+            continue
+        if not isinstance(items, list):
+            return _error(f"Unexpected {out_key} structure")
+        filtered_results[out_key] = _filter_items(items, keys, num_results)
+    if not filtered_results:
+        return _error(spec.missing_error)
+    # Return ultra-clean structure with only essential data
+    return _success(filtered_results)
+
+
+def _run_filtered(spec: FilterSpec, query: str, num_results: int = 10) -> dict:
+    """Call the tool described by `spec` and return its filtered response (or an error dict)."""
+    # Ensure num_results is within reasonable bounds (1-max_results) before any tool work
+    num_results = max(1, min(num_results, spec.max_results))
+    try:
+        # The first lookup lists the tools over the network, so it is guarded like the call itself
+        invoke = _invokers().get(spec.tool)
+        if not invoke:
+            return _error(f"{spec.tool} tool not found")
+        # Call the original tool
+        result = invoke({spec.payload_key: query})
+        if not isinstance(result, dict) or "data" not in result:
+            return _error("Invalid response structure from tool")
+        if spec.extract is not None:
+            return spec.extract(result["data"], num_results)
+        return _extract_sections(spec, result["data"], num_results)
+    except Exception as e:
+        return {"error": f"Tool execution failed: {str(e)}", "successful": False}
 
 # -------------------------------------- Google Search Image Tool --------------------------------------
 
@@ -150,68 +524,24 @@ class FilteredImageSearchInput(BaseModel):
     query: str = Field(description="The search query for finding images")
     num_results: int = Field(default=5, description="Number of image results to return (1-100)")
 
+_IMAGE_SPEC = FilterSpec(
+    tool="COMPOSIO_SEARCH_IMAGE_SEARCH",
+    sections=(("images_results", _IMAGE_KEYS),),
+    max_results=100,
+    missing_error="No image results found in response",
+)
+
 # Custom wrapper for filtered image search
+@_cached_search
 def filtered_image_search(query: str, num_results: int = 5) -> dict:
     """Wrapper that filters COMPOSIO_SEARCH_IMAGE_SEARCH results to reduce token usage"""
-    # Get the raw tool
-    raw_tool = None
-    for tool_item in image_search_tools:
-        if tool_item.name == "COMPOSIO_SEARCH_IMAGE_SEARCH":
-            raw_tool = tool_item
-            break
-
-    if not raw_tool:
-        return {"error": "COMPOSIO_SEARCH_IMAGE_SEARCH tool not found", "successful": False}
-
-    try:
-        # Call the original tool using the tool's invoke method instead of func
-        if hasattr(raw_tool, 'invoke'):
-            result = raw_tool.invoke({"query": query})
-        else:
-            # Fallback to direct function call if invoke doesn't work
-            result = raw_tool.func(query)
-
-        # Extract only what we need - much cleaner approach!
-        if isinstance(result, dict) and "data" in result:
-            data = result["data"]
-
-            # Extract the specified number of image results (default 5, max 100)
-            if "results" in data and "images_results" in data["results"]:
-                # Ensure num_results is within reasonable bounds (1-100)
-                num_results = max(1, min(num_results, 100))
-                limited_images = data["results"]["images_results"][:num_results]
-
-                # Filter each image to only include 'link' and 'original' keys
-                filtered_images = []
-                for image in limited_images:
-                    if isinstance(image, dict):
-                        # Only keep the essential keys
-                        essential_keys = ["link", "original"]
-                        filtered_image = {key: image[key] for key in essential_keys if key in image}
-                        filtered_images.append(filtered_image)
-
-                # Return ultra-clean structure with only essential data
-                return {
-                    "data": {
-                        "results": {
-                            "images_results": filtered_images
-                        }
-                    },
-                    "successful": True
-                }
-            else:
-                return {"error": "No image results found in response", "successful": False}
-        else:
-            return {"error": "Invalid response structure from tool", "successful": False}
-
-    except Exception as e:
-        return {"error": f"Tool execution failed: {str(e)}", "successful": False}
+    return _run_filtered(_IMAGE_SPEC, query, num_results)
 
 # Create the custom tool
 @tool("filtered_composio_image_search", args_schema=FilteredImageSearchInput, return_direct=True)
-def filtered_composio_image_search(query: str, num_results: int = 5) -> dict:
+def filtered_composio_image_search(query: str, num_results: int = 5) -> str:
     """Search for images."""
-    return filtered_image_search(query, num_results)
+    return _tool_json(filtered_image_search(query, num_results))
 
 # --------------------------------------  Google Search Tool --------------------------------------
 
@@ -220,81 +550,24 @@ class FilteredGoogleSearchInput(BaseModel):
     query: str = Field(description="The search query")
     num_results: int = Field(default=10, description="Number of results to return (1-10)")
 
+_GOOGLE_SPEC = FilterSpec(
+    tool="COMPOSIO_SEARCH_SEARCH",
+    sections=(("inline_videos", _VIDEO_KEYS), ("organic_results", _ORGANIC_KEYS)),
+    max_results=10,
+    missing_error="No inline_videos or organic_results found in response",
+)
+
 # Custom wrapper for filtered search
+@_cached_search
 def filtered_google_search(query: str, num_results: int = 10) -> dict:
     """Wrapper that filters COMPOSIO_SEARCH_SEARCH results to reduce token usage"""
-    # Get the raw tool
-    raw_tool = None
-    for tool_item in google_search:
-        if tool_item.name == "COMPOSIO_SEARCH_SEARCH":
-            raw_tool = tool_item
-            break
-
-    if not raw_tool:
-        return {"error": "COMPOSIO_SEARCH_SEARCH tool not found", "successful": False}
-
-    try:
-        # Call the original tool using the tool's invoke method instead of func
-        if hasattr(raw_tool, 'invoke'):
-            result = raw_tool.invoke({"query": query})
-        else:
-            # Fallback to direct function call if invoke doesn't work
-            result = raw_tool.func(query)
-
-        # Extract only what we need - much cleaner approach!
-        if isinstance(result, dict) and "data" in result:
-            data = result["data"]
-
-            # Ensure num_results is within reasonable bounds (1-10)
-            num_results = max(1, min(num_results, 10))
-
-            filtered_results = {}
-
-            # Filter inline_videos results if they exist
-            if "results" in data and "inline_videos" in data["results"]:
-                limited_videos = data["results"]["inline_videos"][:num_results]
-                filtered_videos = []
-                for video in limited_videos:
-                    if isinstance(video, dict):
-                        # Keep essential keys for videos
-                        essential_keys = ["channel", "link", "platform", "title"]
-                        filtered_video = {key: video[key] for key in essential_keys if key in video}
-                        filtered_videos.append(filtered_video)
-                filtered_results["inline_videos"] = filtered_videos
-
-            # Filter organic_results if they exist
-            if "results" in data and "organic_results" in data["results"]:
-                limited_organic = data["results"]["organic_results"][:num_results]
-                filtered_organic = []
-                for organic in limited_organic:
-                    if isinstance(organic, dict):
-                        # Keep essential keys for organic results
-                        essential_keys = ["date", "link", "snippet", "source", "title"]
-                        filtered_organic_result = {key: organic[key] for key in essential_keys if key in organic}
-                        filtered_organic.append(filtered_organic_result)
-                filtered_results["organic_results"] = filtered_organic
-
-            if filtered_results:
-                # Return ultra-clean structure with only essential data
-                return {
-                    "data": {
-                        "results": filtered_results
-                    },
-                    "successful": True
-                }
-            else:
-                return {"error": "No inline_videos or organic_results found in response", "successful": False}
-        else:
-            return {"error": "Invalid response structure from tool", "successful": False}
-
-    except Exception as e:
-        return {"error": f"Tool execution failed: {str(e)}", "successful": False}
+    return _run_filtered(_GOOGLE_SPEC, query, num_results)
 
 # Create the custom tool
 @tool("filtered_composio_google_search", args_schema=FilteredGoogleSearchInput, return_direct=True)
-def filtered_composio_google_search(query: str, num_results: int = 10) -> dict:
+def filtered_composio_google_search(query: str, num_results: int = 10) -> str:
     """Search for any general information."""
-    return filtered_google_search(query, num_results)
+    return _tool_json(filtered_google_search(query, num_results))
 
 # -------------------------------------- Google Maps Search Tool --------------------------------------
 
@@ -302,115 +575,78 @@ def filtered_composio_google_search(query: str, num_results: int = 10) -> dict:
 class FilteredGoogleMapsSearchInput(BaseModel):
     query: str = Field(description="Search query consisting of a specific place name followed by city and country (e.g., 'Eiffel Tower Paris France' or 'Central Park New York USA')")
 
+def _extract_place(data: dict, num_results: int) -> dict:
+    # The happy path dominates, so index directly and treat a missing level as "no results"
+    try:
+        place_results = data["results"]["place_results"]
+    except (KeyError, TypeError):
+        return _error("No place_results found in response")
+    if not place_results:
+        return _error("No place_results found in response")
+
+    # place_results is a dict with the hotel/place info, not a list
+    if isinstance(place_results, dict):
+        return _success({"place_results": _filter_place(place_results)})
+    return _error("Unexpected place_results structure")
+
+
+_MAPS_SPEC = FilterSpec(tool="COMPOSIO_SEARCH_GOOGLE_MAPS_SEARCH", payload_key="q", extract=_extract_place)
+
 # Custom wrapper for filtered google maps search
+@_cached_search
 def filtered_google_maps_search(query: str) -> dict:
     """Wrapper that filters COMPOSIO_SEARCH_GOOGLE_MAPS_SEARCH results to reduce token usage"""
-    # Get the raw tool
-    raw_tool = None
-    for tool_item in google_maps_search:
-        if tool_item.name == "COMPOSIO_SEARCH_GOOGLE_MAPS_SEARCH":
-            raw_tool = tool_item
-            break
+    return _run_filtered(_MAPS_SPEC, query)
 
-    if not raw_tool:
-        return {"error": "COMPOSIO_SEARCH_GOOGLE_MAPS_SEARCH tool not found", "successful": False}
 
-    try:
-        # Call the original tool
-        if hasattr(raw_tool, 'invoke'):
-            result = raw_tool.invoke({"q": query})
-        else:
-            result = raw_tool.func(q=query)
+# Reviews past the top few rarely add signal for the model but cost prompt tokens
+MAX_PLACE_REVIEWS = 5
 
-        # Navigate to place_results
-        if not isinstance(result, dict) or "data" not in result:
-            return {"error": "Invalid response structure from tool", "successful": False}
 
-        data = result["data"]
-        
-        # Handle both response structures
-        place_results = None
-        if isinstance(data, dict) and "results" in data:
-            place_results = data["results"].get("place_results")
-        
-        if not place_results:
-            return {"error": "No place_results found in response", "successful": False}
-
-        # place_results is a dict with the hotel/place info, not a list
-        if isinstance(place_results, dict):
-            filtered_place = _filter_place(place_results)
-            return {
-                "data": {
-                    "results": {
-                        "place_results": filtered_place
-                    }
-                },
-                "successful": True
-            }
-        else:
-            return {"error": "Unexpected place_results structure", "successful": False}
-
-    except Exception as e:
-        return {"error": f"Tool execution failed: {str(e)}", "successful": False}
+def _filter_review(review: dict, _keys: frozenset = _REVIEW_KEYS) -> dict:
+    return {key: review[key] for key in review.keys() & _keys}
 
 
 def _filter_place(place: dict) -> dict:
     """Filter a single place dict to keep only essential information"""
-    # Essential top-level keys
-    essential_keys = [
-        "title", "type", "address", "phone", "rating", "reviews",
-        "description", "amenities", "gps_coordinates"
-    ]
-    
-    filtered_place = {key: place[key] for key in essential_keys if key in place}
-    
-    # Add rating_summary (shows breakdown of star ratings)
-    if "rating_summary" in place:
-        filtered_place["rating_summary"] = place["rating_summary"]
-    
+    # Essential top-level keys, including rating_summary (shows breakdown of star ratings)
+    filtered_place = _project(place, _PLACE_KEYS)
+
     # Filter user_reviews carefully
-    if "user_reviews" in place and isinstance(place["user_reviews"], dict):
-        user_reviews = place["user_reviews"]
+    user_reviews = place.get("user_reviews")
+    if isinstance(user_reviews, dict):
         filtered_user_reviews = {}
-        
-        # Keep most_relevant reviews but limit to essential fields per review
-        if "most_relevant" in user_reviews and isinstance(user_reviews["most_relevant"], list):
-            filtered_most_relevant = []
-            for review in user_reviews["most_relevant"]:
-                if isinstance(review, dict):
-                    filtered_review = {
-                        key: review[key] 
-                        for key in ["date", "description", "rating", "username"]
-                        if key in review
-                    }
-                    if filtered_review:
-                        filtered_most_relevant.append(filtered_review)
-            
+
+        # Keep the top most_relevant reviews, limited to essential fields per review
+        most_relevant = user_reviews.get("most_relevant")
+        if isinstance(most_relevant, list):
+            filtered_most_relevant = [
+                filtered_review
+                for filtered_review in map(_filter_review, itertools.islice(most_relevant, MAX_PLACE_REVIEWS))
+                if filtered_review
+            ]
             if filtered_most_relevant:
                 filtered_user_reviews["most_relevant"] = filtered_most_relevant
-        
+
         # Keep source info (review platform names)
-        if "source" in user_reviews and isinstance(user_reviews["source"], list):
-            filtered_source = []
-            for source in user_reviews["source"]:
-                if isinstance(source, dict) and "name" in source:
-                    filtered_source.append({"name": source["name"]})
-            
+        sources = user_reviews.get("source")
+        if isinstance(sources, list):
+            filtered_source = [{"name": source["name"]} for source in sources if "name" in source]
             if filtered_source:
                 filtered_user_reviews["source"] = filtered_source
-        
+
         if filtered_user_reviews:
             filtered_place["user_reviews"] = filtered_user_reviews
-    
+
     return filtered_place
 
 
 # Create the custom tool
 @tool("filtered_composio_google_maps_search", args_schema=FilteredGoogleMapsSearchInput, return_direct=True)
-def filtered_composio_google_maps_search(query: str) -> dict:
+def filtered_composio_google_maps_search(query: str) -> str:
     """Search for places using Google Maps. Return information and reviews.
     Query should include place name, city, and country for best results."""
-    return filtered_google_maps_search(query)
+    return _tool_json(filtered_google_maps_search(query))
 
 # -------------------------------------- Google News Search Tool --------------------------------------
 
@@ -419,61 +655,24 @@ class FilteredNewsSearchInput(BaseModel):
     query: str = Field(description="The search query for finding news articles")
     num_results: int = Field(default=10, description="Number of news results to return (1-10)")
 
+_NEWS_SPEC = FilterSpec(
+    tool="COMPOSIO_SEARCH_NEWS_SEARCH",
+    sections=(("news_results", _NEWS_KEYS),),
+    max_results=10,
+    missing_error="No news results found in response",
+)
+
 # Custom wrapper for filtered news search
+@_cached_search
 def filtered_news_search(query: str, num_results: int = 10) -> dict:
     """Wrapper that filters COMPOSIO_SEARCH_NEWS_SEARCH results to reduce token usage"""
-    # Get the raw tool
-    raw_tool = None
-    for tool_item in news_search_tools:
-        if tool_item.name == "COMPOSIO_SEARCH_NEWS_SEARCH":
-            raw_tool = tool_item
-            break
-    if not raw_tool:
-        return {"error": "COMPOSIO_SEARCH_NEWS_SEARCH tool not found", "successful": False}
-    try:
-        # Call the original tool using the tool's invoke method instead of func
-        if hasattr(raw_tool, 'invoke'):
-            result = raw_tool.invoke({"query": query})
-        else:
-            # Fallback to direct function call if invoke doesn't work
-            result = raw_tool.func(query)
-        # Extract only what we need - much cleaner approach!
-        if isinstance(result, dict) and "data" in result:
-            data = result["data"]
-            # Extract the specified number of news results (default 10, max 10)
-            if "results" in data and "news_results" in data["results"]:
-                # Ensure num_results is within reasonable bounds (1-10)
-                num_results = max(1, min(num_results, 10))
-                limited_news = data["results"]["news_results"][:num_results]
-                # Filter each news article to only include essential keys
-                filtered_news = []
-                for article in limited_news:
-                    if isinstance(article, dict):
-                        # Only keep the essential keys
-                        essential_keys = ["date", "link", "published_at", "snippet", "title"]
-                        filtered_article = {key: article[key] for key in essential_keys if key in article}
-                        filtered_news.append(filtered_article)
-                # Return ultra-clean structure with only essential data
-                return {
-                    "data": {
-                        "results": {
-                            "news_results": filtered_news
-                        }
-                    },
-                    "successful": True
-                }
-            else:
-                return {"error": "No news results found in response", "successful": False}
-        else:
-            return {"error": "Invalid response structure from tool", "successful": False}
-    except Exception as e:
-        return {"error": f"Tool execution failed: {str(e)}", "successful": False}
+    return _run_filtered(_NEWS_SPEC, query, num_results)
 
 # Create the custom tool
 @tool("filtered_composio_news_search", args_schema=FilteredNewsSearchInput, return_direct=True)
-def filtered_composio_news_search(query: str, num_results: int = 10) -> dict:
+def filtered_composio_news_search(query: str, num_results: int = 10) -> str:
     """Search for latest news."""
-    return filtered_news_search(query, num_results)
+    return _tool_json(filtered_news_search(query, num_results))
 
 # -------------------------------------- Google shopping Search Tool --------------------------------------
 
@@ -482,97 +681,120 @@ class FilteredShoppingSearchInput(BaseModel):
     query: str = Field(description="The search query for finding shopping products")
     num_results: int = Field(default=10, description="Number of shopping results to return (1-50)")
 
+# Key sets are bound as default arguments so the per-item projections read them as fast locals
+def _filter_shopping_item(item: dict, _keys: frozenset = _SHOPPING_KEYS) -> dict:
+    # Essential keys plus the optional delivery info
+    return {key: item[key] for key in item.keys() & _keys}
+
+
+def _iter_shopping_items(data: dict):
+    """Yield raw shopping items (assumed dicts): categorized_shopping_results first, then direct shopping_results"""
+    results = data.get("results", _EMPTY)
+    categorized_results = results.get("categorized_shopping_results")
+    if isinstance(categorized_results, list):
+        shopping_lists = (
+            category_item["shopping_results"]
+            for category_item in categorized_results
+            if isinstance(category_item, dict) and isinstance(category_item.get("shopping_results"), list)
+        )
+        yield from itertools.chain.from_iterable(shopping_lists)
+    shopping_results = results.get("shopping_results")
+    if isinstance(shopping_results, list):
+        yield from shopping_results
+
+def _extract_shopping(data: dict, num_results: int) -> dict:
+    # Single pass over categorized then direct shopping_results, de-duplicating by "title" into an
+    # insertion-ordered dict (first occurrence wins, one hash per item) and stopping as soon as
+    # num_results unique items are collected; only the kept items are then filtered
+    unique_by_title = {}
+    for item in _iter_shopping_items(data):
+        if "title" in item:
+            unique_by_title.setdefault(item["title"], item)
+            if len(unique_by_title) == num_results:
+                break
+    limited_results = [_filter_shopping_item(item) for item in unique_by_title.values()]
+
+    # Return clean structure with all results under shopping_results
+    return _success({"shopping_results": limited_results})
+
+
+_SHOPPING_SPEC = FilterSpec(tool="COMPOSIO_SEARCH_SHOPPING_SEARCH", max_results=50, extract=_extract_shopping)
+
 # Custom wrapper for filtered shopping search
+@_cached_search
 def filtered_shopping_search(query: str, num_results: int = 10) -> dict:
     """Wrapper that filters COMPOSIO_SEARCH_SHOPPING_SEARCH results to reduce token usage"""
-    # Get the raw tool
-    raw_tool = None
-    for tool_item in shopping_tools:
-        if tool_item.name == "COMPOSIO_SEARCH_SHOPPING_SEARCH":
-            raw_tool = tool_item
-            break
-    if not raw_tool:
-        return {"error": "COMPOSIO_SEARCH_SHOPPING_SEARCH tool not found", "successful": False}
-    try:
-        # Call the original tool using the tool's invoke method instead of func
-        if hasattr(raw_tool, 'invoke'):
-            result = raw_tool.invoke({"query": query})
-        else:
-            # Fallback to direct function call if invoke doesn't work
-            result = raw_tool.func(query)
-        # Extract only what we need
-        if isinstance(result, dict) and "data" in result:
-            data = result["data"]
-            
-            # Define essential keys for shopping results
-            essential_keys = ["old_price", "price", "rating", "tag", "thumbnail", "title"]
-            optional_keys = ["delivery"]
-            
-            # Helper function to filter shopping items
-            def filter_shopping_item(item):
-                if isinstance(item, dict):
-                    filtered_item = {key: item[key] for key in essential_keys if key in item}
-                    # Add optional keys if they exist
-                    for opt_key in optional_keys:
-                        if opt_key in item:
-                            filtered_item[opt_key] = item[opt_key]
-                    return filtered_item
-                return item
-            
-            # Collect all shopping results
-            all_shopping_results = []
-            
-            # First, add shopping_results from categorized_shopping_results
-            if "results" in data and "categorized_shopping_results" in data["results"]:
-                categorized_results = data["results"]["categorized_shopping_results"]
-                if isinstance(categorized_results, list):
-                    for category_item in categorized_results:
-                        if isinstance(category_item, dict) and "shopping_results" in category_item:
-                            for item in category_item["shopping_results"]:
-                                if isinstance(item, dict):
-                                    all_shopping_results.append(filter_shopping_item(item))
-            
-            # Then, add shopping_results from direct shopping_results
-            if "results" in data and "shopping_results" in data["results"]:
-                shopping_results = data["results"]["shopping_results"]
-                if isinstance(shopping_results, list):
-                    for item in shopping_results:
-                        if isinstance(item, dict):
-                            all_shopping_results.append(filter_shopping_item(item))
-            
-            # Remove duplicates based on "title"
-            seen_titles = set()
-            unique_shopping_results = []
-            for item in all_shopping_results:
-                if isinstance(item, dict) and "title" in item:
-                    title = item["title"]
-                    if title not in seen_titles:
-                        seen_titles.add(title)
-                        unique_shopping_results.append(item)
-            
-            # Limit to num_results
-            num_results = max(1, min(num_results, 50))
-            limited_results = unique_shopping_results[:num_results]
-            
-            # Return clean structure with all results under shopping_results
-            return {
-                "data": {
-                    "results": {
-                        "shopping_results": limited_results
-                    }
-                },
-                "successful": True
-            }
-        else:
-            return {"error": "Invalid response structure from tool", "successful": False}
-    except Exception as e:
-        return {"error": f"Tool execution failed: {str(e)}", "successful": False}
+    return _run_filtered(_SHOPPING_SPEC, query, num_results)
 
 # Create the custom tool
 @tool("filtered_composio_shopping_search", args_schema=FilteredShoppingSearchInput, return_direct=True)
-def filtered_composio_shopping_search(query: str, num_results: int = 10) -> dict:
+def filtered_composio_shopping_search(query: str, num_results: int = 10) -> str:
     """Search for shopping products."""
-    return filtered_shopping_search(query, num_results)
+    return _tool_json(filtered_shopping_search(query, num_results))
+
+# Search specs by short name
+FILTER_SPECS = {
+    "image": _IMAGE_SPEC,
+    "google": _GOOGLE_SPEC,
+    "maps": _MAPS_SPEC,
+    "news": _NEWS_SPEC,
+    "shopping": _SHOPPING_SPEC,
+}
+
+# -------------------------------------- Concurrent Search Helpers --------------------------------------
+
+# Async variants run the blocking Composio call in a worker thread (sharing the sync wrappers' cache),
+# so independent searches can overlap instead of running back to back.
+async def afiltered_image_search(query: str, num_results: int = 5) -> dict:
+    return await asyncio.to_thread(filtered_image_search, query, num_results)
+
+
+async def afiltered_google_search(query: str, num_results: int = 10) -> dict:
+    return await asyncio.to_thread(filtered_google_search, query, num_results)
+
+
+async def afiltered_google_maps_search(query: str) -> dict:
+    return await asyncio.to_thread(filtered_google_maps_search, query)
+
+
+async def afiltered_news_search(query: str, num_results: int = 10) -> dict:
+    return await asyncio.to_thread(filtered_news_search, query, num_results)
+
+
+async def afiltered_shopping_search(query: str, num_results: int = 10) -> dict:
+    return await asyncio.to_thread(filtered_shopping_search, query, num_results)
+
+
+_ASYNC_SEARCHES = {
+    "image": afiltered_image_search,
+    "google": afiltered_google_search,
+    "maps": afiltered_google_maps_search,
+    "news": afiltered_news_search,
+    "shopping": afiltered_shopping_search,
+}
+
+
+async def _gather_results(awaitables) -> list:
+    # Run concurrently and keep input order; a raised exception becomes that entry's error result
+    results = await asyncio.gather(*awaitables, return_exceptions=True)
+    return [
+        {"error": f"Tool execution failed: {str(r)}", "successful": False} if isinstance(r, BaseException) else r
+        for r in results
+    ]
+
+
+async def filtered_multi_search(queries: list) -> list:
+    """
+    Run several searches concurrently. `queries` is a list of (search_name, query) pairs where
+    search_name is one of image|google|maps|news|shopping. Results are returned in the same order.
+    """
+    async def run_one(search_name: str, query: str) -> dict:
+        search = _ASYNC_SEARCHES.get(search_name)
+        if search is None:
+            return {"error": f"Unknown search: {search_name}", "successful": False}
+        return await search(query)
+
+    return await _gather_results(run_one(name, query) for name, query in queries)
 
 # -------------------------------------- Composio Flight Search Tool --------------------------------------
 
@@ -591,6 +813,13 @@ class FilteredFlightSearchInput(BaseModel):
     travel_class: Optional[int] = Field(default=1, description="Travel class preference. 1 = Economy, 2 = Premium Economy, 3 = Business, 4 = First Class.")
     flight_type: Optional[int] = Field(default=None, description="Flight type filter. 1 = Connecting flights (with layovers), 2 = Direct flights (no layovers). Leave empty for all flights.")
 
+# Airport lists kept from the response, and the keys kept per airport and per flight option
+# (layovers included when available)
+_AIRPORT_DIRECTIONS = ("arrival", "departure")
+_AIRPORT_KEYS = frozenset(("airport", "city", "country", "country_code"))
+_FLIGHT_KEYS = frozenset(("flights", "price", "total_duration", "type", "layovers"))
+
+
 # Custom wrapper for filtered flight search
 def filtered_flight_search(
     arrival_id: str,
@@ -607,171 +836,102 @@ def filtered_flight_search(
     flight_type: Optional[int] = None
 ) -> dict:
     """Wrapper that filters COMPOSIO_SEARCH_FLIGHTS results to reduce token usage"""
-    # Get the raw tool
-    raw_tool = None
-    for tool_item in flight_search:
-        if tool_item.name == "COMPOSIO_SEARCH_FLIGHTS":
-            raw_tool = tool_item
-            break
-    if not raw_tool:
-        return {"error": "COMPOSIO_SEARCH_FLIGHTS tool not found", "successful": False}
+    # Reject malformed dates before paying for a network call
+    date_error = _date_error(outbound_date=outbound_date, return_date=return_date)
+    if date_error is not None:
+        return date_error
+    # Build the input dictionary with provided parameters
+    tool_input = {
+        "arrival_id": arrival_id,
+        "departure_id": departure_id,
+        "outbound_date": outbound_date,
+        "adults": adults,
+        "children": children,
+        "infants": infants,
+    }
+    
+    # Add optional parameters if provided
+    tool_input.update({key: value for key, value in (
+        ("currency", currency),
+        ("gl", gl),
+        ("hl", hl),
+        ("return_date", return_date),
+        ("travel_class", travel_class),
+    ) if value})
+    
+    # Only the tool lookup and upstream call are guarded: they are where transport, auth and SDK errors
+    # come from, while the filtering below only touches type-checked values
     try:
-        # Build the input dictionary with provided parameters
-        tool_input = {
-            "arrival_id": arrival_id,
-            "departure_id": departure_id,
-            "outbound_date": outbound_date,
-            "adults": adults,
-            "children": children,
-            "infants": infants,
-        }
-        
-        # Add optional parameters if provided
-        if currency:
-            tool_input["currency"] = currency
-        if gl:
-            tool_input["gl"] = gl
-        if hl:
-            tool_input["hl"] = hl
-        if return_date:
-            tool_input["return_date"] = return_date
-        if travel_class:
-            tool_input["travel_class"] = travel_class
-        
-        # Call the original tool
-        if hasattr(raw_tool, 'invoke'):
-            result = raw_tool.invoke(tool_input)
-        else:
-            result = raw_tool.func(**tool_input)
-        
-        # Extract only what we need
-        if isinstance(result, dict) and "data" in result:
-            data = result["data"]
-            filtered_result = {
-                "data": {
-                    "results": {}
-                },
-                "successful": True
-            }
-            
-            # Process airports
-            if "results" in data and "airports" in data["results"]:
-                airports = data["results"]["airports"]
-                filtered_airports = {}
-                
-                # Process arrival airports
-                if isinstance(airports, dict) and "arrival" in airports:
-                    arrival_list = airports["arrival"]
-                    if isinstance(arrival_list, list):
-                        filtered_airports["arrival"] = [
-                            {key: airport[key] for key in ["airport", "city", "country", "country_code"] if key in airport}
-                            for airport in arrival_list
-                            if isinstance(airport, dict)
-                        ]
-                
-                # Process departure airports
-                if isinstance(airports, dict) and "departure" in airports:
-                    departure_list = airports["departure"]
-                    if isinstance(departure_list, list):
-                        filtered_airports["departure"] = [
-                            {key: airport[key] for key in ["airport", "city", "country", "country_code"] if key in airport}
-                            for airport in departure_list
-                            if isinstance(airport, dict)
-                        ]
-                
-                if filtered_airports:
-                    filtered_result["data"]["results"]["airports"] = filtered_airports
-            
-            # Helper function to filter flight item
-            def filter_flight_item(flight):
-                if isinstance(flight, dict):
-                    filtered_flight = {key: flight[key] for key in ["flights", "price", "total_duration", "type"] if key in flight}
-                    # Add layovers if available
-                    if "layovers" in flight:
-                        filtered_flight["layovers"] = flight["layovers"]
-                    return filtered_flight
-                return flight
-            
-            # Helper function to check if flight is direct or has layovers
-            def is_direct_flight(flight):
-                """Returns True if flight is direct (no layovers)"""
-                if isinstance(flight, dict):
-                    # If layovers key doesn't exist or is empty, it's direct
-                    layovers = flight.get("layovers")
-                    if layovers is None or (isinstance(layovers, list) and len(layovers) == 0):
-                        return True
-                return False
-            
-            # Collect all available flights from best_flights and other_flights
-            all_flights = []
-            
-            # Add best_flights
-            if "results" in data and "best_flights" in data["results"]:
-                best_flights = data["results"]["best_flights"]
-                if isinstance(best_flights, list):
-                    for flight in best_flights:
-                        if isinstance(flight, dict):
-                            all_flights.append(filter_flight_item(flight))
-            
-            # Add other_flights
-            if "results" in data and "other_flights" in data["results"]:
-                other_flights = data["results"]["other_flights"]
-                if isinstance(other_flights, list):
-                    for flight in other_flights:
-                        if isinstance(flight, dict):
-                            all_flights.append(filter_flight_item(flight))
-            
-            # Filter flights based on flight_type
-            if flight_type == 1:  # Connecting flights (with layovers)
-                available_flights = [f for f in all_flights if not is_direct_flight(f)]
-            elif flight_type == 2:  # Direct flights (no layovers)
-                available_flights = [f for f in all_flights if is_direct_flight(f)]
-            else:  # No filter (all flights)
-                available_flights = all_flights
-            
-            if available_flights:
-                filtered_result["data"]["results"]["available_flights"] = available_flights
-            
-            return filtered_result
-        else:
-            return {"error": "Invalid response structure from tool", "successful": False}
+        # Get the raw tool (the first lookup lists the tools over the network)
+        invoke = _invokers().get("COMPOSIO_SEARCH_FLIGHTS")
+        if not invoke:
+            return _error("COMPOSIO_SEARCH_FLIGHTS tool not found")
+        # Call the original tool (or reuse its recent response for the same input)
+        result = _cached_invoke("COMPOSIO_SEARCH_FLIGHTS", invoke, tool_input)
     except Exception as e:
+        logger.warning("COMPOSIO_SEARCH_FLIGHTS call failed: %s", e)
         return {"error": f"Tool execution failed: {str(e)}", "successful": False}
+    
+    # Extract only what we need
+    if not isinstance(result, dict) or "data" not in result:
+        return _error("Invalid response structure from tool")
+    # Look up results once; without it there is nothing to filter
+    results = _extract(result["data"], "results")
+    if not isinstance(results, dict):
+        return _error("No flight results found in response")
+    # Sections are added only when populated; the envelope is built once on return
+    sections = {}
+    
+    # Process airports
+    airports = results.get("airports")
+    if airports is not None:
+        filtered_airports = {}
+        
+        # Process arrival and departure airports
+        for direction in _AIRPORT_DIRECTIONS:
+            airport_list = _extract(airports, direction)
+            if isinstance(airport_list, list):
+                filtered_airports[direction] = [
+                    _project(airport, _AIRPORT_KEYS) for airport in airport_list if isinstance(airport, dict)
+                ]
+        
+        if filtered_airports:
+            sections["airports"] = filtered_airports
+    
+    # Choose the flight_type predicate once; a flight is direct when its layovers key is
+    # missing, None or an empty list, all of which are falsy
+    if flight_type == 1:  # Connecting flights (with layovers)
+        keep = lambda flight: bool(flight.get("layovers"))
+    elif flight_type == 2:  # Direct flights (no layovers)
+        keep = lambda flight: not flight.get("layovers")
+    else:  # No filter (all flights)
+        keep = None
+    
+    # Collect best_flights then other_flights in a single pass, filtering by flight_type on read
+    flight_lists = (
+        flights
+        for flights in (results.get("best_flights"), results.get("other_flights"))
+        if isinstance(flights, list)
+    )
+    available_flights = [
+        _project(flight, _FLIGHT_KEYS)
+        for flight in itertools.chain.from_iterable(flight_lists)
+        if isinstance(flight, dict) and (keep is None or keep(flight))
+    ]
+    
+    if available_flights:
+        sections["available_flights"] = available_flights
+    
+    return _success(sections)
 
 # Create the custom tool
 @tool("filtered_composio_flight_search", args_schema=FilteredFlightSearchInput, return_direct=True)
-def filtered_composio_flight_search(
-    arrival_id: str,
-    departure_id: str,
-    outbound_date: str,
-    adults: int = 1,
-    children: int = 0,
-    infants: int = 0,
-    currency: Optional[str] = None,
-    gl: Optional[str] = None,
-    hl: Optional[str] = None,
-    return_date: Optional[str] = None,
-    travel_class: int = 1,
-    flight_type: Optional[int] = None
-) -> dict:
+def filtered_composio_flight_search(**kwargs) -> str:
     """Search for flights with comprehensive pricing, schedule, and airline information. 
     this tool finds available flights between cities/airports with detailed pricing, multiple airlines, departure/arrival times, flight duration.
     supports round-trip and one-way searches, multiple passenger types (adults, children, infants), different travel classes, direct and with layover flights, and international pricing in various currencies
     perfect for travel planning, and price comparison."""
-    return filtered_flight_search(
-        arrival_id=arrival_id,
-        departure_id=departure_id,
-        outbound_date=outbound_date,
-        adults=adults,
-        children=children,
-        infants=infants,
-        currency=currency,
-        gl=gl,
-        hl=hl,
-        return_date=return_date,
-        travel_class=travel_class,
-        flight_type=flight_type
-    )
+    return _tool_json(filtered_flight_search(**kwargs))
 
 # -------------------------------------- Composio Hotel Search Tool --------------------------------------
 
@@ -794,6 +954,27 @@ class FilteredHotelSearchInput(BaseModel):
     num_results: Optional[int] = Field(default=5, description="Number of hotel results to return (1-10).")
     include_ratings_and_reviews: Optional[bool] = Field(default=None, description="If True, Include rating and review information (location_rating, overall_rating, ratings, reviews, reviews_breakdown).")
 
+# Keys kept per property (deal included when available); the rating keys only when ratings and
+# reviews are requested
+_HOTEL_ESSENTIAL_KEYS = frozenset((
+    "amenities", "check_in_time", "check_out_time", "description", "gps_coordinates",
+    "hotel_class", "name", "rate_per_night", "link", "type", "deal",
+))
+_HOTEL_RATING_KEYS = frozenset(("location_rating", "overall_rating", "ratings", "reviews", "reviews_breakdown"))
+
+
+@functools.lru_cache(maxsize=None)
+def _hotel_property_keys(include_images: bool, include_nearby_places: bool, include_ratings_and_reviews: bool) -> frozenset:
+    """Property keys to keep for one combination of the include_* flags (eight sets at most)."""
+    keys = set(_HOTEL_ESSENTIAL_KEYS)
+    if include_images:
+        keys.add("images")
+    if include_nearby_places:
+        keys.add("nearby_places")
+    if include_ratings_and_reviews:
+        keys |= _HOTEL_RATING_KEYS
+    return frozenset(keys)
+
 # Custom wrapper for filtered hotel search
 def filtered_hotel_search(
     check_in_date: str,
@@ -814,147 +995,118 @@ def filtered_hotel_search(
     include_ratings_and_reviews: Optional[bool] = None
 ) -> dict:
     """Wrapper that filters COMPOSIO_SEARCH_HOTELS results to reduce token usage"""
-    # Get the raw tool
-    raw_tool = None
-    for tool_item in hotel_search:
-        if tool_item.name == "COMPOSIO_SEARCH_HOTELS":
-            raw_tool = tool_item
-            break
-    if not raw_tool:
-        return {"error": "COMPOSIO_SEARCH_HOTELS tool not found", "successful": False}
+    # Reject malformed dates before paying for a network call
+    date_error = _date_error(check_in_date=check_in_date, check_out_date=check_out_date)
+    if date_error is not None:
+        return date_error
+    # Ensure num_results is within bounds (1-10); the model may send null for the Optional field
+    num_results = max(1, min(num_results or 5, 10))
+    # Build the input dictionary with provided parameters
+    tool_input = {
+        "check_in_date": check_in_date,
+        "check_out_date": check_out_date,
+        "q": q,
+        "adults": adults,
+        "children": children,
+    }
+    
+    # Add optional parameters if provided; flags and prices are sent whenever they are set, even as False/0
+    tool_input.update({key: value for key, value in (
+        ("currency", currency),
+        ("gl", gl),
+        ("hl", hl),
+        ("hotel_class", hotel_class),
+    ) if value})
+    tool_input.update({key: value for key, value in (
+        ("free_cancellation", free_cancellation),
+        ("max_price", max_price),
+        ("min_price", min_price),
+    ) if value is not None})
+    
+    # Only the tool lookup and upstream call are guarded: they are where transport, auth and SDK errors
+    # come from, while the filtering below only touches type-checked values
     try:
-        # Build the input dictionary with provided parameters
-        tool_input = {
-            "check_in_date": check_in_date,
-            "check_out_date": check_out_date,
-            "q": q,
-            "adults": adults,
-            "children": children,
-        }
-        
-        # Add optional parameters if provided
-        if currency:
-            tool_input["currency"] = currency
-        if free_cancellation is not None:
-            tool_input["free_cancellation"] = free_cancellation
-        if gl:
-            tool_input["gl"] = gl
-        if hl:
-            tool_input["hl"] = hl
-        if hotel_class:
-            tool_input["hotel_class"] = hotel_class
-        if max_price is not None:
-            tool_input["max_price"] = max_price
-        if min_price is not None:
-            tool_input["min_price"] = min_price
-        
-        # Call the original tool
-        if hasattr(raw_tool, 'invoke'):
-            result = raw_tool.invoke(tool_input)
-        else:
-            result = raw_tool.func(**tool_input)
-        
-        # Extract only what we need
-        if isinstance(result, dict) and "data" in result:
-            data = result["data"]
-            filtered_result = {
-                "data": {
-                    "results": {}
-                },
-                "successful": True
-            }
-            
-            # Ensure num_results is within bounds (1-10)
-            num_results = max(1, min(num_results, 10))
-            
-            # Process hotels/properties
-            if "results" in data and "properties" in data["results"]:
-                properties = data["results"]["properties"]
-                if isinstance(properties, list):
-                    filtered_properties = []
-                    
-                    for prop in properties[:num_results]:
-                        if isinstance(prop, dict):
-                            filtered_prop = {}
-                            
-                            # Always include these keys
-                            essential_keys = ["amenities", "check_in_time", "check_out_time", 
-                                            "description", "gps_coordinates", "hotel_class", 
-                                            "name", "rate_per_night", "link", "type"]
-                            
-                            for key in essential_keys:
-                                if key in prop:
-                                    filtered_prop[key] = prop[key]
-                            
-                            # Add deal if available
-                            if "deal" in prop:
-                                filtered_prop["deal"] = prop["deal"]
-                            
-                            # Add images if requested
-                            if include_images and "images" in prop:
-                                filtered_prop["images"] = prop["images"]
-                            
-                            # Add nearby_places if requested
-                            if include_nearby_places and "nearby_places" in prop:
-                                filtered_prop["nearby_places"] = prop["nearby_places"]
-                            
-                            # Add ratings and reviews if requested
-                            if include_ratings_and_reviews:
-                                rating_keys = ["location_rating", "overall_rating", "ratings", 
-                                             "reviews", "reviews_breakdown"]
-                                for key in rating_keys:
-                                    if key in prop:
-                                        filtered_prop[key] = prop[key]
-                            
-                            filtered_properties.append(filtered_prop)
-                    
-                    filtered_result["data"]["results"]["properties"] = filtered_properties
-            
-            return filtered_result
-        else:
-            return {"error": "Invalid response structure from tool", "successful": False}
+        # Get the raw tool (the first lookup lists the tools over the network)
+        invoke = _invokers().get("COMPOSIO_SEARCH_HOTELS")
+        if not invoke:
+            return _error("COMPOSIO_SEARCH_HOTELS tool not found")
+        # Call the original tool (or reuse its recent response for the same input)
+        result = _cached_invoke("COMPOSIO_SEARCH_HOTELS", invoke, tool_input)
     except Exception as e:
+        logger.warning("COMPOSIO_SEARCH_HOTELS call failed: %s", e)
         return {"error": f"Tool execution failed: {str(e)}", "successful": False}
+    
+    # Extract only what we need
+    if not isinstance(result, dict) or "data" not in result:
+        return _error("Invalid response structure from tool")
+    # Look up results once; without it there is nothing to filter
+    results = _extract(result["data"], "results")
+    if not isinstance(results, dict):
+        return _error("No hotel results found in response")
+    # Sections are added only when populated; the envelope is built once on return
+    sections = {}
+    
+    # Process hotels/properties
+    properties = results.get("properties")
+    if isinstance(properties, list):
+        # Essential keys plus whatever the include_* flags ask for, resolved once per call
+        wanted = _hotel_property_keys(
+            bool(include_images), bool(include_nearby_places), bool(include_ratings_and_reviews)
+        )
+        # Take the first num_results dict properties, skipping malformed entries without copying the list
+        dict_properties = (prop for prop in properties if isinstance(prop, dict))
+        sections["properties"] = [
+            _project(prop, wanted)
+            for prop in itertools.islice(dict_properties, num_results)
+        ]
+    
+    return _success(sections)
 
 # Create the custom tool
 @tool("filtered_composio_hotel_search", args_schema=FilteredHotelSearchInput, return_direct=True)
-def filtered_composio_hotel_search(
-    check_in_date: str,
-    check_out_date: str,
-    q: str,
-    adults: int = 1,
-    children: int = 0,
-    currency: Optional[str] = None,
-    free_cancellation: Optional[bool] = None,
-    gl: Optional[str] = None,
-    hl: Optional[str] = None,
-    hotel_class: Optional[str] = None,
-    max_price: Optional[int] = None,
-    min_price: Optional[int] = None,
-    include_images: Optional[bool] = None,
-    include_nearby_places: Optional[bool] = None,
-    num_results: int = 5,
-    include_ratings_and_reviews: Optional[bool] = None
-) -> dict:
+def filtered_composio_hotel_search(**kwargs) -> str:
     """Search for hotels with comprehensive filtering and pricing. 
     this tool finds available accommodations with detailed information including:
       pricing, ratings, amenities and photos. supports price range filtering, star rating selection and free cancellation options. 
       perfect for travel planning, accommodation comparison, and finding the best lodging options for any destination. ."""
-    return filtered_hotel_search(
-        check_in_date=check_in_date,
-        check_out_date=check_out_date,
-        q=q,
-        adults=adults,
-        children=children,
-        currency=currency,
-        free_cancellation=free_cancellation,
-        gl=gl,
-        hl=hl,
-        hotel_class=hotel_class,
-        max_price=max_price,
-        min_price=min_price,
-        include_images=include_images,
-        include_nearby_places=include_nearby_places,
-        num_results=num_results,
-        include_ratings_and_reviews=include_ratings_and_reviews
-    )
\ No newline at end of file
+    return _tool_json(filtered_hotel_search(**kwargs))
+
+
+
+async def afiltered_flight_search(*args, **kwargs) -> dict:
+    return await asyncio.to_thread(filtered_flight_search, *args, **kwargs)
+
+
+async def afiltered_hotel_search(*args, **kwargs) -> dict:
+    return await asyncio.to_thread(filtered_hotel_search, *args, **kwargs)
+
+
+async def filtered_flight_search_many(batch: list) -> list:
+    """
+    Run several flight searches concurrently (e.g. multi-city or flexible-date planning). Each entry of
+    `batch` is a dict of filtered_flight_search keyword arguments. Results are returned in the same order.
+    """
+    return await _gather_results(afiltered_flight_search(**search) for search in batch)
+
+
+async def filtered_hotel_search_many(batch: list) -> list:
+    """
+    Run several hotel searches concurrently. Each entry of `batch` is a dict of filtered_hotel_search
+    keyword arguments. Results are returned in the same order.
+    """
+    return await _gather_results(afiltered_hotel_search(**search) for search in batch)
+
+
+# Bad arguments from the model come back to it as a tool error message instead of raising through the agent.
+# Each tool also gets its async twin, so an agent's parallel tool calls (ainvoke) overlap their network waits.
+for _agent_tool, _coroutine in (
+    (filtered_composio_image_search, afiltered_image_search),
+    (filtered_composio_google_search, afiltered_google_search),
+    (filtered_composio_google_maps_search, afiltered_google_maps_search),
+    (filtered_composio_news_search, afiltered_news_search),
+    (filtered_composio_shopping_search, afiltered_shopping_search),
+    (filtered_composio_flight_search, afiltered_flight_search),
+    (filtered_composio_hotel_search, afiltered_hotel_search),
+):
+    _agent_tool.handle_validation_error = True
+    _agent_tool.coroutine = _json_coroutine(_coroutine)
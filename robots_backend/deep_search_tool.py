@@ -1,6 +1,10 @@
 from langchain_core.tools import tool
 from pydantic import BaseModel, Field
 from ddgs import DDGS
+from collections import OrderedDict
+import asyncio
+import hashlib
+import re
 import time
 from datetime import datetime
 from langchain_core.prompts import ChatPromptTemplate
@@ -16,6 +20,16 @@ from server_sent_events import add_url_to_stream, clear_url_stream, signal_strea
 # Create current date for time-aware search queries
 CURRENT_DATE = datetime.now().strftime("%Y-%m-%d")
 
+# Gemini sometimes wraps URLs in square brackets: [https://example.com] -> https://example.com
+_BRACKET_URL_RE = re.compile(r'\[(\s*https?://[^\]]+)\]')
+# Standalone brackets that might remain after unwrapping
+_STRAY_BRACKET_RE = re.compile(r'\[\s*\]|\[\s*https?://[^\]]*\]')
+
+
+def _clean_urls(content: str) -> str:
+    """Remove square brackets around URLs in a Gemini response."""
+    return _STRAY_BRACKET_RE.sub('', _BRACKET_URL_RE.sub(r'\1', content))
+
 # --- Setup Gemini clients ---
 # Use flash-lite for query expansion (shares quota with agent)
 llm_expansion = ChatGoogleGenerativeAI(
@@ -31,9 +45,49 @@ llm_summarization = ChatGoogleGenerativeAI(
     temperature=0.1,
 )
 
+# --- Result cache ---
+# Repeat research skips the LLM and search round trips: subqueries, per-subquery search results, batch
+# summaries and final reports are kept in one in-process LRU. Entries expire so time-sensitive topics refresh,
+# and failures/fallbacks are never stored. Cached values are shared, so callers must not mutate them.
+DEEP_SEARCH_CACHE_SIZE = 512
+SEARCH_CACHE_TTL_SECONDS = 60 * 60
+LLM_CACHE_TTL_SECONDS = 24 * 60 * 60
+_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+def _cache_get(key):
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del _cache[key]
+            return None
+        _cache.move_to_end(key)
+        return value
+
+def _cache_set(key, value, ttl: float):
+    with _cache_lock:
+        _cache[key] = (time.monotonic() + ttl, value)
+        _cache.move_to_end(key)
+        while len(_cache) > DEEP_SEARCH_CACHE_SIZE:
+            _cache.popitem(last=False)
+
+def _normalize(query: str) -> str:
+    return " ".join(query.lower().split())
+
+def _digest(text: str) -> str:
+    # Long prompt inputs are keyed by a fixed-size hash instead of the text itself
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
 # --- Helpers ---
 def duckduckgo_search(query: str, max_results: int = 25):
     """Search DuckDuckGo with error handling."""
+    cache_key = ("search", _normalize(query), max_results)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return list(cached)
     try:
         with DDGS(timeout=10) as ddg:
             results = [r for r in ddg.text(
@@ -45,6 +99,8 @@ def duckduckgo_search(query: str, max_results: int = 25):
                 # backend='bing, brave, google, mullvad_brave, mullvad_google, yahoo, yandex'
                 backend='auto'
             )]
+        if results:
+            _cache_set(cache_key, tuple(results), SEARCH_CACHE_TTL_SECONDS)
         return results
     except Exception as e:
         print(f"Search error for query '{query}': {e}")
@@ -62,6 +118,11 @@ def expand_queries_with_gemini(query: str, research_domain: str = "general"):
         "legal": "You are a legal research strategist. Generate 5 legal search queries for comprehensive research, include the original query in the list."
     }
     
+    cache_key = ("subqueries", _normalize(query), research_domain)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return list(cached)
+    
     system_prompt = domain_context.get(research_domain, domain_context["general"])
     
     prompt = ChatPromptTemplate.from_messages([
@@ -83,40 +144,66 @@ def expand_queries_with_gemini(query: str, research_domain: str = "general"):
                 if clean_query:
                     subqueries.append(clean_query)
         
-        return subqueries[:5] if subqueries else [query]
+        if not subqueries:
+            return [query]
+        _cache_set(cache_key, tuple(subqueries[:5]), LLM_CACHE_TTL_SECONDS)
+        return subqueries[:5]
     except Exception as e:
         print(f"Error generating subqueries: {e}")
         return [query]  # Fallback to original query
 
 
-def collect_results(subqueries, max_results=25, delay=5):
+# DuckDuckGo rate-limits bursts, so at most this many subquery searches run at once
+SEARCH_CONCURRENCY = 3
+
+
+async def collect_results_async(subqueries, max_results=25):
     """
-    Run searches for all subqueries with throttling and deduplication.
-    Push each discovered URL to SSE immediately and return full results list.
+    Run searches for all subqueries concurrently (at most SEARCH_CONCURRENCY at a time) with deduplication.
+    Push each discovered URL to SSE as soon as its search finishes and return full results list.
     """
+    semaphore = asyncio.Semaphore(SEARCH_CONCURRENCY)
+    streamed_urls = set()
+
+    async def search_one(sq):
+        async with semaphore:
+            print(f"Searching: {sq}")
+            # DDGS is blocking, so each search runs in a worker thread
+            results = await asyncio.to_thread(duckduckgo_search, sq, max_results)
+        # Stream incrementally via SSE as each search finishes (back on the event loop, so no lock is needed)
+        for result in results:
+            url = (result.get("href") or "").strip()
+            if url and url not in streamed_urls:
+                streamed_urls.add(url)
+                add_url_to_stream(url)
+        return results
+
     all_results = []
     seen_urls = set()
 
-    for i, sq in enumerate(subqueries):
-        print(f"Searching: {sq}")
-        current_delay = delay + (i * 2)
-        time.sleep(current_delay)
-
-        results = duckduckgo_search(sq, max_results=max_results)
-
+    # Merge in subquery order, not completion order, so the same searches always give the same
+    # batches (and hit the batch-summary and final-report caches)
+    for results in await asyncio.gather(*(search_one(sq) for sq in subqueries)):
         for result in results:
             url = (result.get("href") or "").strip()
             if url and url not in seen_urls:
                 seen_urls.add(url)
                 all_results.append(result)
-                # Stream incrementally via SSE
-                add_url_to_stream(url)
 
     return all_results
 
 
+def collect_results(subqueries, max_results=25):
+    """Synchronous wrapper around collect_results_async."""
+    return asyncio.run(collect_results_async(subqueries, max_results=max_results))
+
+
+# Batch summaries are independent, so they are requested together, a few at a time to stay under the RPM quota
+SUMMARY_CONCURRENCY = 5
+
+
 def batch_summarize(results, batch_size=25, research_domain="general"):
-    """Summarize search results in batches to avoid token explosion."""
+    """Summarize search results in batches to avoid token explosion, running the batches concurrently."""
     if not results:
         return []
     
@@ -133,7 +220,7 @@ def batch_summarize(results, batch_size=25, research_domain="general"):
     system_prompt = domain_instructions.get(research_domain, domain_instructions["general"])
     
     batches = [results[i:i+batch_size] for i in range(0, len(results), batch_size)]
-    summaries = []
+    text_blocks = []
     
     for i, batch in enumerate(batches):
         print(f"Summarizing batch {i+1}/{len(batches)}")
@@ -150,31 +237,41 @@ def batch_summarize(results, batch_size=25, research_domain="general"):
 
         text_block = "\n".join(snippets)
         print(f"Final text block: {text_block[:300]}...")  # Debug: Check final text block
-        
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", system_prompt),
-            ("human", "Here are search results to summarize:\n\n{text}\n\nProvide a summary highlighting the most important information and insights. For each fact or claim, include the source link as a plain URL (e.g., https://example.com) without brackets or additional formatting.")
-        ])
-        
-        try:
-            time.sleep(2)  # Rate limiting
-            chain = prompt | llm_summarization  # Batch summaries use flash
-            response = chain.invoke({"text": text_block})
-
-            # Clean up Gemini's response to remove square brackets around URLs
-            cleaned_content = response.content
-            # Remove square brackets around URLs: [https://example.com] -> https://example.com
-            import re
-            cleaned_content = re.sub(r'\[(\s*https?://[^\]]+)\]', r'\1', cleaned_content)
-            # Also remove any standalone brackets that might remain
-            cleaned_content = re.sub(r'\[\s*\]|\[\s*https?://[^\]]*\]', '', cleaned_content)
-
-            summaries.append(cleaned_content)
-        except Exception as e:
-            print(f"Error summarizing batch {i+1}: {e}")
+        text_blocks.append(text_block)
+    
+    prompt = ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        ("human", "Here are search results to summarize:\n\n{text}\n\nProvide a summary highlighting the most important information and insights. For each fact or claim, include the source link as a plain URL (e.g., https://example.com) without brackets or additional formatting.")
+    ])
+    chain = prompt | llm_summarization  # Batch summaries use flash
+    
+    # Batches summarized recently (same domain, same text) are reused; only the rest go to the model
+    cache_keys = [("batch_summary", research_domain, _digest(text_block)) for text_block in text_blocks]
+    summaries = [_cache_get(cache_key) for cache_key in cache_keys]
+    misses = [i for i, summary in enumerate(summaries) if summary is None]
+    
+    # One request per missing batch, fanned out on a thread pool (bounded by SUMMARY_CONCURRENCY); a failed
+    # batch comes back as its exception so the others are kept. Synchronous on purpose: the shared LLM
+    # client binds to the first event loop it runs on, so asyncio.run per call breaks later calls.
+    responses = chain.batch(
+        [{"text": text_blocks[i]} for i in misses],
+        config={"max_concurrency": SUMMARY_CONCURRENCY},
+        return_exceptions=True,
+    ) if misses else []
+    
+    for i, response in zip(misses, responses):
+        if isinstance(response, Exception):
+            print(f"Error summarizing batch {i+1}: {response}")
             continue
+
+        # Clean up Gemini's response to remove square brackets around URLs
+        cleaned_content = _clean_urls(response.content)
+
+        summaries[i] = cleaned_content
+        _cache_set(cache_keys[i], cleaned_content, LLM_CACHE_TTL_SECONDS)
     
-    return summaries
+    return [summary for summary in summaries if summary is not None]
+
 
 def final_summarize(summaries, query, research_domain="general"):
     """Take multiple batch summaries and merge into one comprehensive answer using gemini-2.0-flash."""
@@ -196,6 +293,11 @@ def final_summarize(summaries, query, research_domain="general"):
     
     report_type = domain_context.get(research_domain, domain_context["general"])
     
+    cache_key = ("final_summary", _normalize(query), research_domain, _digest(joined))
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
     prompt = ChatPromptTemplate.from_messages([
         ("system", f"You are an expert research analyst. Create a {report_type} that synthesizes information from multiple sources."),
         ("human", """Today's date is {current_date}. Use this date context when analyzing trends, recent developments, and time-sensitive information.
@@ -224,12 +326,9 @@ Structure your response with clear headings and organize the information logical
         response = chain.invoke({"summaries": joined, "query": query, "current_date": CURRENT_DATE})
 
         # Clean up Gemini's response to remove square brackets around URLs
-        cleaned_content = response.content
-        import re
-        cleaned_content = re.sub(r'\[(\s*https?://[^\]]+)\]', r'\1', cleaned_content)
-        # Also remove any standalone brackets that might remain
-        cleaned_content = re.sub(r'\[\s*\]|\[\s*https?://[^\]]*\]', '', cleaned_content)
+        cleaned_content = _clean_urls(response.content)
 
+        _cache_set(cache_key, cleaned_content, LLM_CACHE_TTL_SECONDS)
         return cleaned_content
     except Exception as e:
         print(f"Error in final summarization: {e}")
@@ -272,8 +371,7 @@ def deep_search(query: str, research_domain: str = "general", max_results_per_qu
     def run_collection():
         results_container["all_results"] = collect_results(
             subqueries,
-            max_results=max_results_per_query,
-            delay=3
+            max_results=max_results_per_query
         )
 
     t = threading.Thread(target=run_collection, daemon=True)